@@ -0,0 +1,240 @@
+"""
+Columnar export of users, user_preferences and game_sessions for analytics.
+
+Each table is streamed from SQLite in fixed-size chunks and written as one
+row group / record batch per chunk, so memory use depends on --batch-size,
+not on table size. JSON list columns are decoded into list<string>.
+
+Exports are incremental: the highest exported users.id, game_sessions.id
+and user_preferences.revision are kept in <out>/_watermarks.json, and the
+next run only writes rows past them as a new part file per table. A --full
+export is written to a staging directory and replaces each table directory
+as a whole, so no earlier part files are left next to it.
+
+Usage:
+    python analytics_export.py --db game_helper.db --out exports/
+    python analytics_export.py --db game_helper.db --out exports/ --format arrow --full
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+WATERMARK_FILE = '_watermarks.json'
+FULL_STAGING_DIR = '_full_export'
+
+# table -> (watermark column, columns never exported)
+EXPORT_TABLES = {
+    'users': ('id', {'password_hash'}),
+    'user_preferences': ('revision', set()),
+    'game_sessions': ('id', set()),
+}
+
+JSON_LIST_COLUMNS = {'leisure_devices', 'cognitive_focus_areas'}
+
+
+def _decode_list(value) -> Optional[List[str]]:
+    if value is None or value == '':
+        return None
+    try:
+        parsed = json.loads(value)
+    except (TypeError, json.JSONDecodeError):
+        return None
+    return [str(v) for v in parsed] if isinstance(parsed, list) else None
+
+
+def _decode_timestamp(value) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _identity(value):
+    return value
+
+
+def table_schema(conn: sqlite3.Connection, table: str,
+                 exclude: set) -> Tuple[List[str], pa.Schema, List[Callable]]:
+    """
+    Map a table's declared SQLite column types to an Arrow schema.
+    Returns: (column names, schema, per-column value converters)
+    """
+    columns, fields, converters = [], [], []
+    for _, name, declared, *_ in conn.execute(f'PRAGMA table_info({table})'):
+        if name in exclude:
+            continue
+        declared = (declared or '').upper()
+        if name in JSON_LIST_COLUMNS:
+            arrow_type, convert = pa.list_(pa.string()), _decode_list
+        elif declared == 'INTEGER':
+            arrow_type, convert = pa.int64(), _identity
+        elif declared == 'REAL':
+            arrow_type, convert = pa.float64(), _identity
+        elif declared == 'TIMESTAMP':
+            arrow_type, convert = pa.timestamp('us'), _decode_timestamp
+        else:
+            arrow_type, convert = pa.string(), _identity
+        columns.append(name)
+        fields.append(pa.field(name, arrow_type))
+        converters.append(convert)
+    return columns, pa.schema(fields), converters
+
+
+class _PartWriter:
+    """Write record batches to a Parquet or Arrow IPC file."""
+
+    def __init__(self, path: str, schema: pa.Schema, fmt: str):
+        self.fmt = fmt
+        if fmt == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema, compression='zstd')
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write(self, batch: pa.RecordBatch):
+        if self.fmt == 'parquet':
+            # One call per batch keeps each chunk in its own row group
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self):
+        self._writer.close()
+        if self.fmt != 'parquet':
+            self._sink.close()
+
+
+def export_table(conn: sqlite3.Connection, table: str, out_dir: str, since: Optional[int],
+                 fmt: str = 'parquet', batch_size: int = 50000) -> Tuple[int, Optional[int]]:
+    """
+    Export rows of table whose watermark column is past since (all rows if
+    since is None) into a new part file under out_dir/table/.
+    Must run inside the caller's read transaction so the watermark and the
+    exported rows come from the same snapshot.
+    Returns: (rows written, new watermark)
+    """
+    watermark_column, exclude = EXPORT_TABLES[table]
+    upto = conn.execute(f'SELECT MAX({watermark_column}) FROM {table}').fetchone()[0]
+    if since is None:
+        # Rows of databases not yet migrated by DatabaseManager have no value
+        where, params = f'{watermark_column} IS NULL OR {watermark_column} <= ?', [upto or 0]
+    else:
+        if upto is None or upto <= since:
+            return 0, since
+        where, params = f'{watermark_column} > ? AND {watermark_column} <= ?', [since, upto]
+
+    columns, schema, converters = table_schema(conn, table, exclude)
+    table_dir = os.path.join(out_dir, table)
+    os.makedirs(table_dir, exist_ok=True)
+    extension = 'parquet' if fmt == 'parquet' else 'arrow'
+    path = os.path.join(table_dir, f'part-{since or 0}-{upto or 0}.{extension}')
+    tmp_path = path + '.tmp'
+
+    cursor = conn.execute(f'SELECT {", ".join(columns)} FROM {table} WHERE {where}', params)
+    writer = _PartWriter(tmp_path, schema, fmt)
+    rows_written = 0
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            arrays = [
+                pa.array([convert(value) for value in values], type=field.type)
+                for values, convert, field in zip(zip(*rows), converters, schema)
+            ]
+            writer.write(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows_written += len(rows)
+    finally:
+        writer.close()
+
+    if rows_written:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+    return rows_written, upto if upto is not None else since
+
+
+def load_watermarks(out_dir: str) -> Dict[str, Optional[int]]:
+    path = os.path.join(out_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_watermarks(out_dir: str, watermarks: Dict[str, Optional[int]]):
+    path = os.path.join(out_dir, WATERMARK_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(watermarks, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _replace_table_dirs(staging_dir: str, out_dir: str):
+    """Swap each table directory exported into staging_dir in for the one in out_dir."""
+    for table in EXPORT_TABLES:
+        target = os.path.join(out_dir, table)
+        retired = target + '.old'
+        if os.path.exists(retired):
+            shutil.rmtree(retired)
+        if os.path.exists(target):
+            os.rename(target, retired)
+        os.rename(os.path.join(staging_dir, table), target)
+        if os.path.exists(retired):
+            shutil.rmtree(retired)
+    os.rmdir(staging_dir)
+
+
+def export_analytics(db_path: str, out_dir: str, fmt: str = 'parquet', batch_size: int = 50000,
+                     full: bool = False) -> Dict[str, int]:
+    """
+    Export every table in EXPORT_TABLES and advance the stored watermarks.
+    full: ignore stored watermarks, export everything and replace the
+    existing part files of each table.
+    Returns: rows written per table
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    watermarks = {} if full else load_watermarks(out_dir)
+    written = {}
+    table_root = out_dir
+    if full:
+        table_root = os.path.join(out_dir, FULL_STAGING_DIR)
+        # Left over from an interrupted full export
+        shutil.rmtree(table_root, ignore_errors=True)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # A single read transaction gives all tables one consistent snapshot
+        conn.execute('BEGIN')
+        for table in EXPORT_TABLES:
+            written[table], watermarks[table] = export_table(
+                conn, table, table_root, watermarks.get(table), fmt=fmt, batch_size=batch_size)
+        conn.rollback()
+    finally:
+        conn.close()
+
+    if full:
+        _replace_table_dirs(table_root, out_dir)
+    save_watermarks(out_dir, watermarks)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--db', default='game_helper.db')
+    parser.add_argument('--out', required=True, help='export directory')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet')
+    parser.add_argument('--batch-size', type=int, default=50000, help='rows per row group')
+    parser.add_argument('--full', action='store_true', help='ignore watermarks and export everything')
+    args = parser.parse_args()
+
+    written = export_analytics(args.db, args.out, fmt=args.format, batch_size=args.batch_size, full=args.full)
+    for table, rows in written.items():
+        print(f'{table}: {rows} rows')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class AuditLogger:
+    """
+    Asynchronous, batched writer for the recommendation_audit table.
+
+    log() only enqueues, so page renders never wait on the database. A
+    background thread writes queued events in batches of up to batch_size,
+    at least every flush_interval seconds. The queue is bounded: when it is
+    full, log() waits at most `timeout` seconds (no wait by default) and then
+    drops the event and counts it, so a stalled database cannot grow memory
+    without bound or stall the UI.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_queue: int = 10000,
+                 batch_size: int = 500, flush_interval: float = 1.0):
+        self._connect = connect
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._stats = {'enqueued': 0, 'dropped': 0, 'written': 0, 'failed': 0, 'batches': 0}
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, event_type: str, username: Optional[str], payload: Dict,
+            timeout: Optional[float] = None) -> bool:
+        """
+        Queue an audit event.
+        Returns: False if the event was dropped because the queue stayed full
+        """
+        record = (event_type, username, json.dumps(payload, default=str))
+        try:
+            if timeout:
+                self._queue.put(record, timeout=timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for enqueued, dropped, written and failed events, plus queue depth."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has been written (or failed)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Write out the queue and stop the background thread."""
+        self._closed.set()
+        self._thread.join(timeout)
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _next_batch(self) -> List[tuple]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (self._closed.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while not (self._closed.is_set() and self._queue.empty()):
+                batch = self._next_batch()
+                if batch:
+                    self._write(conn, batch)
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[tuple]):
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT INTO recommendation_audit (event_type, username, payload) VALUES (?, ?, ?)',
+                batch
+            )
+            conn.commit()
+            self._count('written', len(batch))
+            self._count('batches')
+        except sqlite3.Error:
+            conn.rollback()
+            self._count('failed', len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
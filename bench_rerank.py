@@ -0,0 +1,77 @@
+"""
+Benchmark and coverage check for the diversity re-ranking stage.
+
+Builds a synthetic catalog whose relevance is skewed towards one cognitive
+focus area, then compares plain top-k with MMR re-ranking on latency and
+on how many of the user's chosen focus areas the top-k covers.
+
+Usage:
+    python bench_rerank.py --games 100000 --k 10 --cap 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from reranking import DIVERSITY_ATTRIBUTES, attribute_coverage, encode_attributes, focus_coverage, mmr_rerank
+from user_features import COGNITIVE_FOCUS_AREAS
+
+PLATFORMS = ["Web", "Mobile", "PC", "Tablet", "Gaming Console"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def synthetic_catalog(n: int, rng: np.random.Generator):
+    """Games plus relevance scores that favour the first focus area."""
+    focus = rng.integers(len(COGNITIVE_FOCUS_AREAS), size=n)
+    platform = rng.integers(len(PLATFORMS), size=n)
+    difficulty = rng.integers(len(DIFFICULTIES), size=n)
+    games = [
+        {"title": f"Game {i}", "cognitive_focus": COGNITIVE_FOCUS_AREAS[f],
+         "platform": PLATFORMS[p], "difficulty": DIFFICULTIES[d]}
+        for i, (f, p, d) in enumerate(zip(focus, platform, difficulty))
+    ]
+    relevance = rng.normal(size=n) + np.where(focus == 0, 0.5, 0.0)
+    return games, relevance
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--cap", type=int, default=200, help="candidate cap C")
+    parser.add_argument("--diversity", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    games, relevance = synthetic_catalog(args.games, rng)
+    attributes = encode_attributes(games, DIVERSITY_ATTRIBUTES)
+    focus_areas = COGNITIVE_FOCUS_AREAS[:3]
+
+    top, top_time = timed(lambda: np.argsort(-relevance)[:args.k], args.repeat)
+    mmr, mmr_time = timed(lambda: mmr_rerank(relevance, attributes, args.k, args.diversity, args.cap), args.repeat)
+
+    for name, order, seconds in (("top-k", top, top_time), ("mmr", mmr, mmr_time)):
+        picked = [games[i] for i in order]
+        print(f"{name:<6} {seconds * 1000:8.3f} ms  "
+              f"focus coverage {focus_coverage(picked, focus_areas):5.0%}  "
+              f"distinct {attribute_coverage(picked)}  "
+              f"mean relevance {relevance[order].mean():.3f}")
+
+    # Cost should grow with k*C, not with N^2
+    for cap in (args.cap // 2, args.cap, args.cap * 2):
+        _, seconds = timed(lambda: mmr_rerank(relevance, attributes, args.k, args.diversity, cap), args.repeat)
+        print(f"mmr C={cap:<5} {seconds * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
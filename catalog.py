@@ -0,0 +1,189 @@
+"""
+Versioned, hot-reloadable game catalog.
+
+A CatalogSnapshot is immutable: the game records, the NumPy arrays the
+recommender works on, the lookup indexes and the text index are all built
+once, before the snapshot is published. CatalogLoader watches the source
+file from a background thread, builds a complete new snapshot when the file
+changes and swaps it in with a single reference assignment. A request that
+took a snapshot keeps using it until it finishes, so a reload never blocks
+a request or changes the catalog under it, and sessions never reload on
+their own. snapshot.version is a SHA-256 prefix of the source file's bytes,
+so every process, and every restart, reports the same version for the same
+catalog and caches or audit records can key on it.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from difficulty import game_rating
+from reranking import DIVERSITY_ATTRIBUTES, encode_attributes
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games_catalog.json')
+REQUIRED_FIELDS = ('title', 'difficulty', 'platform', 'cognitive_focus', 'description')
+# Hex digits of the content hash kept as the catalog version
+VERSION_LENGTH = 16
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class CatalogSnapshot:
+    """One immutable version of the catalog and everything derived from it."""
+
+    def __init__(self, games: Sequence[Dict], version: str, source_mtime: Optional[float] = None):
+        for i, game in enumerate(games):
+            if not isinstance(game, dict):
+                raise ValueError(f"Catalog entry {i} must be a JSON object")
+            missing = [field for field in REQUIRED_FIELDS if field not in game]
+            if missing:
+                raise ValueError(f"Catalog entry {i} is missing {', '.join(missing)}")
+            not_text = [field for field in REQUIRED_FIELDS if not isinstance(game[field], str)]
+            if not_text:
+                raise ValueError(f"Catalog entry {i} must have string values for {', '.join(not_text)}")
+
+        self.version = version
+        self.source_mtime = source_mtime
+        self.loaded_at = time.time()
+        self.games: Tuple[Mapping, ...] = tuple(MappingProxyType(dict(game)) for game in games)
+
+        self.ratings = np.array([game_rating(game['difficulty']) for game in self.games], dtype=np.float64)
+        self.attributes = encode_attributes(self.games, DIVERSITY_ATTRIBUTES)
+        for array in (self.ratings, self.attributes):
+            array.setflags(write=False)
+
+        self._by_title = {game['title']: i for i, game in enumerate(self.games)}
+        by_focus: Dict[str, List[int]] = {}
+        postings: Dict[str, set] = {}
+        for i, game in enumerate(self.games):
+            by_focus.setdefault(game['cognitive_focus'], []).append(i)
+            for token in tokenize(f"{game['title']} {game['description']}"):
+                postings.setdefault(token, set()).add(i)
+        self._by_focus = {focus: np.array(ids, dtype=np.int64) for focus, ids in by_focus.items()}
+        self._text_index = {token: np.array(sorted(ids), dtype=np.int64) for token, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def find(self, title: str) -> Optional[Mapping]:
+        """Return the game with the given title, if any."""
+        i = self._by_title.get(title)
+        return None if i is None else self.games[i]
+
+    def by_focus(self, cognitive_focus: str) -> np.ndarray:
+        """Indices of games training a cognitive area."""
+        return self._by_focus.get(cognitive_focus, np.empty(0, dtype=np.int64))
+
+    def search(self, text: str) -> List[Mapping]:
+        """Games whose title or description contains every word of text."""
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        hits = None
+        for token in tokens:
+            postings = self._text_index.get(token)
+            if postings is None:
+                return []
+            hits = postings if hits is None else np.intersect1d(hits, postings, assume_unique=True)
+        return [self.games[i] for i in hits]
+
+
+def load_catalog(path: str) -> Tuple[List[Dict], str]:
+    """
+    Read a catalog file.
+    Returns: (games, version) where version is derived from the file's bytes
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    games = json.loads(data)
+    if not isinstance(games, list):
+        raise ValueError(f"{path} must contain a JSON list of games")
+    return games, hashlib.sha256(data).hexdigest()[:VERSION_LENGTH]
+
+
+class CatalogLoader:
+    """
+    Serve the latest CatalogSnapshot of a JSON catalog file.
+
+    The first snapshot is built in the constructor; afterwards a daemon thread
+    checks the file every poll_interval seconds and rebuilds on change. A file
+    that fails to load or validate is reported in last_error and the previous
+    snapshot stays in service.
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH, poll_interval: float = 5.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.last_error: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._signature = self._stat()
+        games, version = load_catalog(path)
+        self._snapshot = CatalogSnapshot(games, version=version, source_mtime=self._signature[0])
+        self._thread = threading.Thread(target=self._watch, name='catalog-reloader', daemon=True)
+        self._thread.start()
+
+    def current(self) -> CatalogSnapshot:
+        """The snapshot to use for one request; hold on to it rather than calling again."""
+        return self._snapshot
+
+    @property
+    def version(self) -> str:
+        return self._snapshot.version
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the snapshot if the source changed (or always with force).
+        A file rewritten with the same content keeps the current snapshot.
+        Returns: True if a new snapshot was swapped in
+        """
+        with self._reload_lock:
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return False
+            try:
+                games, version = load_catalog(self.path)
+                if not force and version == self._snapshot.version:
+                    self._signature = signature
+                    self.last_error = None
+                    return False
+                snapshot = CatalogSnapshot(games, version=version, source_mtime=signature[0])
+            except (OSError, ValueError) as e:
+                self.last_error = f"Error loading catalog: {str(e)}"
+                return False
+            self._signature = signature
+            self.last_error = None
+            # Publishing is a single reference assignment; readers see the old
+            # or the new snapshot, never a partially built one.
+            self._snapshot = snapshot
+            return True
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _stat(self) -> Tuple[float, int]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return 0.0, -1
+        return stat.st_mtime, stat.st_size
+
+    def _watch(self):
+        while not self._stopped.wait(self.poll_interval):
+            # One bad file or unexpected failure must never stop reloading
+            try:
+                self.reload()
+            except Exception as e:
+                self.last_error = f"Error loading catalog: {str(e)}"
+
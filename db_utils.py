@@ -1,22 +1,49 @@
 import sqlite3
 import hashlib
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import json
 
+from difficulty import DEFAULT_RATING, DEFAULT_RD, game_rating, outcome_from_score, update_skill
+from user_features import (COGNITIVE_FOCUS_AREAS, FEATURE_COLUMNS, LEISURE_DEVICES, SCALE_FIELDS,
+                           YES_NO_FIELDS, encode_mask, encode_preferences, supersets)
+from write_queue import GroupCommitWriter
+
 class DatabaseManager:
-    def __init__(self, db_path: str = 'game_helper.db'):
+    def __init__(self, db_path: str = 'game_helper.db', serialize_writes: bool = False,
+                 busy_timeout: float = 5.0):
+        """
+        serialize_writes: route every write through a single background writer
+        that batches concurrent writes into group commits (see write_queue).
+        busy_timeout: seconds a connection waits on a locked database before
+        failing with "database is locked".
+        """
         self.db_path = db_path
+        self.busy_timeout = busy_timeout
         self.init_db()
+        self.writer = GroupCommitWriter(self.get_db_connection, self._begin_write) if serialize_writes else None
 
     def get_db_connection(self):
         """Create and return a database connection."""
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+        # Safe with WAL: a crash can lose the last commits but never corrupts the file.
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def close(self):
+        """Flush and stop the background writer, if any."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
 
     def init_db(self):
         """Initialize the database with required tables."""
         conn = self.get_db_connection()
         c = conn.cursor()
         
+        # WAL lets readers proceed while a writer holds the lock; the mode is
+        # persistent, so this only has to happen once per database file.
+        c.execute('PRAGMA journal_mode=WAL')
+        
         # Create users table
         c.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -69,94 +96,213 @@ class DatabaseManager:
             )
         ''')
         
+        # Change counter for incremental exports; added by migration on older files
+        self._ensure_column(c, 'user_preferences', 'revision', 'INTEGER')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_user_preferences_revision ON user_preferences (revision)')
+        # Rows from before the migration get revisions past every existing one,
+        # so incremental exports see them once rather than again on their next write
+        c.execute('SELECT IFNULL(MAX(revision), 0) FROM user_preferences')
+        c.execute('UPDATE user_preferences SET revision = ? + user_id WHERE revision IS NULL', (c.fetchone()[0],))
+        
+        # Create game_sessions table (one row per played session, append-only)
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS game_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                game_name TEXT NOT NULL,
+                score REAL,
+                duration REAL,
+                difficulty TEXT,
+                played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+        ''')
+        self._ensure_column(c, 'game_sessions', 'cognitive_focus', 'TEXT')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_game_sessions_user ON game_sessions (user_id, id)')
+        
+        # Per-user, per-cognitive-area skill estimate (see difficulty)
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS user_skill (
+                user_id INTEGER NOT NULL,
+                cognitive_area TEXT NOT NULL,
+                rating REAL NOT NULL,
+                rd REAL NOT NULL,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, cognitive_area),
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Append-only log of what was recommended and why (written by audit_log.AuditLogger)
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS recommendation_audit (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                event_type TEXT NOT NULL,
+                username TEXT,
+                payload TEXT NOT NULL
+            )
+        ''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_recommendation_audit_user ON recommendation_audit (username, id)')
+        
+        # Integer-encoded copy of user_preferences for cohort queries (see user_features)
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS user_features (
+                user_id INTEGER PRIMARY KEY,
+                memory_challenge_severity INTEGER,
+                focus_difficulty INTEGER,
+                navigation_ability INTEGER,
+                time_spent INTEGER,
+                device_mask INTEGER NOT NULL DEFAULT 0,
+                focus_mask INTEGER NOT NULL DEFAULT 0,
+                yes_flags INTEGER NOT NULL DEFAULT 0,
+                gender INTEGER,
+                gameplay_preference INTEGER,
+                game_preferences_type INTEGER,
+                progress_tracking INTEGER,
+                FOREIGN KEY (user_id) REFERENCES user_preferences(user_id)
+            )
+        ''')
+        # Cohort queries enumerate the matching masks, so every query is a set of
+        # index seeks with a severity range. The trailing columns make the index
+        # covering for the other filters, and user_id rides along as the rowid.
+        c.execute('DROP INDEX IF EXISTS idx_user_features_cohort')
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_features_cohort_covering
+            ON user_features (device_mask, focus_mask, memory_challenge_severity,
+                              yes_flags, focus_difficulty, navigation_ability, time_spent)
+        ''')
+        
+        c.execute('''
+            SELECT IFNULL((SELECT MAX(user_id) FROM user_preferences), 0)
+                 > IFNULL((SELECT MAX(user_id) FROM user_features), 0)
+        ''')
+        needs_backfill = c.fetchone()[0]
+        
         conn.commit()
         conn.close()
+        
+        if needs_backfill:
+            self.rebuild_user_features()
+
+    @staticmethod
+    def _ensure_column(c: sqlite3.Cursor, table: str, column: str, declaration: str):
+        """Add a column to an existing table if it is missing."""
+        c.execute(f'PRAGMA table_info({table})')
+        if column not in [row[1] for row in c.fetchall()]:
+            c.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
 
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using SHA-256."""
         return hashlib.sha256(password.encode()).hexdigest()
 
-    def create_user(self, username: str, password: str, user_data: Dict) -> Tuple[bool, str]:
+    def _begin_write(self, conn: sqlite3.Connection):
+        """Start a write transaction, taking the write lock up front."""
+        # IMMEDIATE waits for the lock via busy_timeout instead of failing
+        # later when a deferred read transaction tries to upgrade.
+        conn.execute('BEGIN IMMEDIATE')
+
+    def _execute_write(self, fn: Callable, args: tuple, error_prefix: str) -> Tuple[bool, str]:
         """
-        Create a new user with their preferences.
-        Returns: Tuple of (success: bool, message: str)
+        Run fn(cursor, *args) in a write transaction.
+        fn returns (success, message); the transaction is committed only on success.
         """
+        if self.writer is not None:
+            return self.writer.submit(fn, args, error_prefix)
+        
         conn = self.get_db_connection()
         c = conn.cursor()
         
         try:
-            # Start transaction
-            conn.execute('BEGIN')
-            
-            # Insert into users table
+            self._begin_write(conn)
+            result = fn(c, *args)
+            if result[0]:
+                conn.commit()
+            else:
+                conn.rollback()
+            return result
+        except Exception as e:
+            conn.rollback()
+            return False, f"{error_prefix}: {str(e)}"
+        finally:
+            conn.close()
+
+    def create_user(self, username: str, password: str, user_data: Dict) -> Tuple[bool, str]:
+        """
+        Create a new user with their preferences.
+        Returns: Tuple of (success: bool, message: str)
+        """
+        return self._execute_write(self._create_user_tx, (username, password, user_data),
+                                   "Error creating user")
+
+    def _create_user_tx(self, c: sqlite3.Cursor, username: str, password: str,
+                        user_data: Dict) -> Tuple[bool, str]:
+        """Insert a user and their preferences using an open write transaction."""
+        # Insert into users table
+        try:
             c.execute(
                 'INSERT INTO users (username, password_hash, full_name, age, gender, contact_info, primary_caregiver) '
                 'VALUES (?, ?, ?, ?, ?, ?, ?)',
                 (username, self.hash_password(password), user_data['full_name'], user_data['age'],
                  user_data['gender'], user_data['contact_info'], user_data['primary_caregiver'])
             )
-            user_id = c.lastrowid
-            
-            # Convert lists to JSON strings for storage
-            user_prefs = user_data.copy()
-            for key in ['leisure_devices', 'cognitive_focus_areas']:
-                if key in user_prefs and isinstance(user_prefs[key], list):
-                    user_prefs[key] = json.dumps(user_prefs[key])
-            
-            # Insert into user_preferences table
-            c.execute('''
-                INSERT INTO user_preferences (
-                    user_id, memory_challenge_severity, focus_difficulty, everyday_problems,
-                    remembering_info, navigation_ability, language_difficulties,
-                    physical_limitations, physical_details, device_usability,
-                    leisure_devices, game_preferences, time_spent, gameplay_preference,
-                    multiplayer_interaction, accommodations_needed, accommodations_details,
-                    visual_hearing_impairments, impairments_details, frustrating_game_mechanics,
-                    cognitive_focus_areas, ideal_game_description, desired_outcomes,
-                    previous_experience, games_tried, enjoyed_aspects, difficulties,
-                    game_preferences_type, game_values, progress_tracking
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                user_id, user_prefs['memory_challenge_severity'], user_prefs['focus_difficulty'],
-                user_prefs['everyday_problems'], user_prefs['remembering_info'],
-                user_prefs['navigation_ability'], user_prefs['language_difficulties'],
-                user_prefs['physical_limitations'],
-                user_prefs.get('physical_details'),
-                user_prefs['device_usability'],
-                user_prefs['leisure_devices'],
-                user_prefs['game_preferences'],
-                user_prefs['time_spent'],
-                user_prefs['gameplay_preference'],
-                user_prefs['multiplayer_interaction'],
-                user_prefs['accommodations_needed'],
-                user_prefs.get('accommodations_details'),
-                user_prefs['visual_hearing_impairments'],
-                user_prefs.get('impairments_details'),
-                user_prefs['frustrating_game_mechanics'],
-                user_prefs['cognitive_focus_areas'],
-                user_prefs['ideal_game_description'],
-                user_prefs['desired_outcomes'],
-                user_prefs['previous_experience'],
-                user_prefs.get('games_tried'),
-                user_prefs.get('enjoyed_aspects'),
-                user_prefs.get('difficulties'),
-                user_prefs['game_preferences_type'],
-                user_prefs['game_values'],
-                user_prefs['progress_tracking']
-            ))
-            
-            conn.commit()
-            return True, "User created successfully"
-            
         except sqlite3.IntegrityError:
-            conn.rollback()
             return False, "Username already exists"
-        except Exception as e:
-            conn.rollback()
-            return False, f"Error creating user: {str(e)}"
-        finally:
-            conn.close()
+        user_id = c.lastrowid
+        
+        # Convert lists to JSON strings for storage
+        user_prefs = user_data.copy()
+        for key in ['leisure_devices', 'cognitive_focus_areas']:
+            if key in user_prefs and isinstance(user_prefs[key], list):
+                user_prefs[key] = json.dumps(user_prefs[key])
+        
+        # Insert into user_preferences table
+        c.execute('''
+            INSERT INTO user_preferences (
+                user_id, memory_challenge_severity, focus_difficulty, everyday_problems,
+                remembering_info, navigation_ability, language_difficulties,
+                physical_limitations, physical_details, device_usability,
+                leisure_devices, game_preferences, time_spent, gameplay_preference,
+                multiplayer_interaction, accommodations_needed, accommodations_details,
+                visual_hearing_impairments, impairments_details, frustrating_game_mechanics,
+                cognitive_focus_areas, ideal_game_description, desired_outcomes,
+                previous_experience, games_tried, enjoyed_aspects, difficulties,
+                game_preferences_type, game_values, progress_tracking
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            user_id, user_prefs['memory_challenge_severity'], user_prefs['focus_difficulty'],
+            user_prefs['everyday_problems'], user_prefs['remembering_info'],
+            user_prefs['navigation_ability'], user_prefs['language_difficulties'],
+            user_prefs['physical_limitations'],
+            user_prefs.get('physical_details'),
+            user_prefs['device_usability'],
+            user_prefs['leisure_devices'],
+            user_prefs['game_preferences'],
+            user_prefs['time_spent'],
+            user_prefs['gameplay_preference'],
+            user_prefs['multiplayer_interaction'],
+            user_prefs['accommodations_needed'],
+            user_prefs.get('accommodations_details'),
+            user_prefs['visual_hearing_impairments'],
+            user_prefs.get('impairments_details'),
+            user_prefs['frustrating_game_mechanics'],
+            user_prefs['cognitive_focus_areas'],
+            user_prefs['ideal_game_description'],
+            user_prefs['desired_outcomes'],
+            user_prefs['previous_experience'],
+            user_prefs.get('games_tried'),
+            user_prefs.get('enjoyed_aspects'),
+            user_prefs.get('difficulties'),
+            user_prefs['game_preferences_type'],
+            user_prefs['game_values'],
+            user_prefs['progress_tracking']
+        ))
+        self._bump_revision(c, user_id)
+        self._refresh_user_features(c, user_id)
+        
+        return True, "User created successfully"
 
     def verify_user(self, username: str, password: str) -> bool:
         """Verify user credentials."""
@@ -208,37 +354,282 @@ class DatabaseManager:
 
     def update_user_preferences(self, username: str, preferences: Dict) -> Tuple[bool, str]:
         """Update user preferences."""
+        return self._execute_write(self._update_user_preferences_tx, (username, preferences),
+                                   "Error updating preferences")
+
+    def _update_user_preferences_tx(self, c: sqlite3.Cursor, username: str,
+                                    preferences: Dict) -> Tuple[bool, str]:
+        """Update user preferences using an open write transaction."""
+        # Get user ID
+        c.execute('SELECT id FROM users WHERE username = ?', (username,))
+        result = c.fetchone()
+        if not result:
+            return False, "User not found"
+        
+        user_id = result[0]
+        
+        # Prepare preferences for update
+        prefs = preferences.copy()
+        for key in ['leisure_devices', 'cognitive_focus_areas']:
+            if key in prefs and isinstance(prefs[key], list):
+                prefs[key] = json.dumps(prefs[key])
+        
+        # Update preferences
+        placeholders = ', '.join(f'{k} = ?' for k in prefs.keys())
+        query = f'UPDATE user_preferences SET {placeholders} WHERE user_id = ?'
+        
+        c.execute(query, list(prefs.values()) + [user_id])
+        self._bump_revision(c, user_id)
+        self._refresh_user_features(c, user_id)
+        
+        return True, "Preferences updated successfully"
+
+    @staticmethod
+    def _bump_revision(c: sqlite3.Cursor, user_id: int):
+        """
+        Stamp a preferences row with the next revision number. Writers hold the
+        write lock, so revisions increase in commit order.
+        """
+        c.execute('''
+            UPDATE user_preferences
+            SET revision = (SELECT IFNULL(MAX(revision), 0) + 1 FROM user_preferences)
+            WHERE user_id = ?
+        ''', (user_id,))
+
+    def record_game_session(self, username: str, game_data: Dict) -> Tuple[bool, str]:
+        """
+        Store one played session and update the user's skill estimate for the
+        game's cognitive area in the same transaction.
+        game_data: game_name, score (0-100), duration, difficulty and cognitive_focus
+        of the session.
+        """
+        return self._execute_write(self._record_game_session_tx, (username, game_data),
+                                   "Error recording session")
+
+    def _record_game_session_tx(self, c: sqlite3.Cursor, username: str,
+                                game_data: Dict) -> Tuple[bool, str]:
+        """Insert a game session using an open write transaction."""
+        c.execute('SELECT id FROM users WHERE username = ?', (username,))
+        result = c.fetchone()
+        if not result:
+            return False, "User not found"
+        
+        user_id = result[0]
+        
+        c.execute(
+            'INSERT INTO game_sessions (user_id, game_name, score, duration, difficulty, cognitive_focus) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (user_id, game_data['game_name'], game_data['score'], game_data['duration'],
+             game_data.get('difficulty'), game_data.get('cognitive_focus'))
+        )
+        if game_data.get('cognitive_focus') and game_data.get('difficulty') and game_data['score'] is not None:
+            self._update_skill(c, user_id, game_data['cognitive_focus'], game_data['difficulty'],
+                               game_data['score'])
+        
+        return True, "Session recorded successfully"
+
+    @staticmethod
+    def _update_skill(c: sqlite3.Cursor, user_id: int, cognitive_area: str, difficulty: str, score: float):
+        """Fold one session outcome into the stored skill estimate."""
+        c.execute('''
+            SELECT rating, rd, sessions, julianday('now') - julianday(updated_at)
+            FROM user_skill
+            WHERE user_id = ? AND cognitive_area = ?
+        ''', (user_id, cognitive_area))
+        row = c.fetchone()
+        rating, rd, sessions, days_idle = row if row else (DEFAULT_RATING, DEFAULT_RD, 0, 0.0)
+        
+        rating, rd = update_skill(rating, rd, game_rating(difficulty), outcome_from_score(score), days_idle or 0.0)
+        c.execute('''
+            INSERT OR REPLACE INTO user_skill (user_id, cognitive_area, rating, rd, sessions, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (user_id, cognitive_area, rating, rd, sessions + 1))
+
+    def get_user_skills(self, username: str) -> Dict[str, Dict]:
+        """
+        Retrieve a user's skill estimates.
+        Returns: {cognitive_area: {'rating': ..., 'rd': ..., 'sessions': ...}}
+        """
         conn = self.get_db_connection()
         c = conn.cursor()
         
         try:
-            # Start transaction
-            conn.execute('BEGIN')
-            
-            # Get user ID
-            c.execute('SELECT id FROM users WHERE username = ?', (username,))
-            result = c.fetchone()
-            if not result:
-                return False, "User not found"
-            
-            user_id = result[0]
-            
-            # Prepare preferences for update
-            prefs = preferences.copy()
-            for key in ['leisure_devices', 'cognitive_focus_areas']:
-                if key in prefs and isinstance(prefs[key], list):
-                    prefs[key] = json.dumps(prefs[key])
-            
-            # Update preferences
-            placeholders = ', '.join(f'{k} = ?' for k in prefs.keys())
-            query = f'UPDATE user_preferences SET {placeholders} WHERE user_id = ?'
-            
-            c.execute(query, list(prefs.values()) + [user_id])
+            c.execute('''
+                SELECT s.cognitive_area, s.rating, s.rd, s.sessions
+                FROM user_skill s
+                JOIN users u ON u.id = s.user_id
+                WHERE u.username = ?
+            ''', (username,))
+            return {area: {'rating': rating, 'rd': rd, 'sessions': sessions}
+                    for area, rating, rd, sessions in c.fetchall()}
+        finally:
+            conn.close()
+
+    def get_game_sessions(self, username: str) -> List[Dict]:
+        """Retrieve a user's game sessions, oldest first."""
+        conn = self.get_db_connection()
+        c = conn.cursor()
+        
+        try:
+            c.execute('''
+                SELECT gs.game_name, gs.score, gs.duration, gs.difficulty, gs.cognitive_focus, gs.played_at
+                FROM game_sessions gs
+                JOIN users u ON u.id = gs.user_id
+                WHERE u.username = ?
+                ORDER BY gs.id
+            ''', (username,))
+            columns = [desc[0] for desc in c.description]
+            return [dict(zip(columns, row)) for row in c.fetchall()]
+        finally:
+            conn.close()
+
+    _FEATURE_SOURCE_QUERY = '''
+        SELECT up.*, u.gender
+        FROM user_preferences up
+        JOIN users u ON u.id = up.user_id
+    '''
+
+    def _store_user_features(self, c: sqlite3.Cursor, rows: Iterable[Dict]):
+        values = []
+        for row in rows:
+            features = encode_preferences(row)
+            values.append([row['user_id']] + [features[col] for col in FEATURE_COLUMNS])
+        
+        placeholders = ', '.join('?' for _ in FEATURE_COLUMNS)
+        c.executemany(
+            f'INSERT OR REPLACE INTO user_features (user_id, {", ".join(FEATURE_COLUMNS)}) '
+            f'VALUES (?, {placeholders})',
+            values
+        )
+
+    def _refresh_user_features(self, c: sqlite3.Cursor, user_id: int):
+        """Re-encode one user's preferences inside the caller's transaction."""
+        c.execute(self._FEATURE_SOURCE_QUERY + ' WHERE up.user_id = ?', (user_id,))
+        columns = [desc[0] for desc in c.description]
+        rows = [dict(zip(columns, row)) for row in c.fetchall()]
+        self._store_user_features(c, rows)
+
+    def rebuild_user_features(self, chunk_size: int = 10000) -> int:
+        """
+        Re-encode user_features from user_preferences for every user.
+        Returns: number of users encoded
+        """
+        conn = self.get_db_connection()
+        read = conn.cursor()
+        write = conn.cursor()
+        
+        try:
+            self._begin_write(conn)
+            write.execute('DELETE FROM user_features')
+            read.execute(self._FEATURE_SOURCE_QUERY)
+            columns = [desc[0] for desc in read.description]
+            total = 0
+            while True:
+                chunk = read.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                self._store_user_features(write, (dict(zip(columns, row)) for row in chunk))
+                total += len(chunk)
             conn.commit()
-            
-            return True, "Preferences updated successfully"
-        except Exception as e:
+            return total
+        except Exception:
             conn.rollback()
-            return False, f"Error updating preferences: {str(e)}"
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _cohort_filter(min_severity: Optional[int] = None, max_severity: Optional[int] = None,
+                       devices: Iterable[str] = (), focus_areas: Iterable[str] = (),
+                       yes_answers: Iterable[str] = (), no_answers: Iterable[str] = (),
+                       **scale_ranges: Tuple[Optional[int], Optional[int]]) -> Tuple[str, List]:
+        """Build the WHERE clause shared by find_cohort and count_cohort."""
+        for name, values, options in (('device', devices, LEISURE_DEVICES),
+                                      ('focus area', focus_areas, COGNITIVE_FOCUS_AREAS),
+                                      ('answer', list(yes_answers) + list(no_answers), YES_NO_FIELDS)):
+            unknown = set(values) - set(options)
+            if unknown:
+                raise ValueError(f"Unknown {name}(s): {', '.join(sorted(unknown))}")
+        
+        device_masks = supersets(encode_mask(devices, LEISURE_DEVICES), len(LEISURE_DEVICES))
+        focus_masks = supersets(encode_mask(focus_areas, COGNITIVE_FOCUS_AREAS), len(COGNITIVE_FOCUS_AREAS))
+        clauses = [
+            f'device_mask IN ({", ".join(map(str, device_masks))})',
+            f'focus_mask IN ({", ".join(map(str, focus_masks))})',
+        ]
+        params: List = []
+        
+        ranges = dict(scale_ranges)
+        ranges['memory_challenge_severity'] = (min_severity, max_severity)
+        for column, (low, high) in ranges.items():
+            if column not in SCALE_FIELDS:
+                raise ValueError(f"Unknown scale column: {column}")
+            if low is not None:
+                clauses.append(f'{column} >= ?')
+                params.append(low)
+            if high is not None:
+                clauses.append(f'{column} <= ?')
+                params.append(high)
+        
+        yes_bits = encode_mask(yes_answers, YES_NO_FIELDS)
+        no_bits = encode_mask(no_answers, YES_NO_FIELDS)
+        if yes_bits or no_bits:
+            clauses.append('yes_flags & ? = ?')
+            params.extend([yes_bits | no_bits, yes_bits])
+        
+        return ' AND '.join(clauses), params
+
+    def find_cohort(self, limit: Optional[int] = 100, **filters) -> List[str]:
+        """
+        Return usernames of users matching every filter, e.g.
+        find_cohort(min_severity=7, devices=['Tablet'], focus_areas=['Attention']).
+        
+        Filters: min_severity/max_severity, devices and focus_areas (user selected
+        all of them), yes_answers/no_answers (names from user_features.YES_NO_FIELDS),
+        and focus_difficulty/navigation_ability/time_spent as (low, high) tuples.
+        """
+        where, params = self._cohort_filter(**filters)
+        query = f'''
+            SELECT u.username
+            FROM user_features uf
+            JOIN users u ON u.id = uf.user_id
+            WHERE {where}
+        '''
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        conn = self.get_db_connection()
+        try:
+            return [row[0] for row in conn.execute(query, params)]
+        finally:
+            conn.close()
+
+    def count_cohort(self, **filters) -> int:
+        """Count users matching the same filters as find_cohort."""
+        where, params = self._cohort_filter(**filters)
+        conn = self.get_db_connection()
+        try:
+            return conn.execute(f'SELECT COUNT(*) FROM user_features WHERE {where}', params).fetchone()[0]
+        finally:
+            conn.close()
+
+    def get_recommendation_audit(self, username: str, limit: int = 50) -> List[Dict]:
+        """Retrieve a user's most recent audit events, newest first, with payloads parsed."""
+        conn = self.get_db_connection()
+        c = conn.cursor()
+        
+        try:
+            c.execute('''
+                SELECT id, created_at, event_type, payload
+                FROM recommendation_audit
+                WHERE username = ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (username, limit))
+            return [
+                {'id': row_id, 'created_at': created_at, 'event_type': event_type, 'payload': json.loads(payload)}
+                for row_id, created_at, event_type, payload in c.fetchall()
+            ]
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
@@ -0,0 +1,77 @@
+"""
+Online difficulty calibration.
+
+Each user has one skill estimate per cognitive area, kept as a Glicko-style
+(rating, rating deviation) pair. Games are placed on the same scale by
+their difficulty label. Every session updates the estimate in O(1) from
+the previous estimate and the session outcome alone, so no history is
+ever rescanned. The deviation shrinks as evidence accumulates and grows
+again while a user is idle, which makes the first sessions after a break
+move the rating more.
+"""
+import math
+from typing import Tuple
+
+DEFAULT_RATING = 1500.0
+DEFAULT_RD = 350.0
+MIN_RD = 30.0
+# Grows a settled deviation back to DEFAULT_RD in roughly half a year of inactivity
+RD_GROWTH_PER_DAY = 25.0
+
+DIFFICULTY_RATINGS = {
+    "Easy": 1300.0,
+    "Medium": 1500.0,
+    "Hard": 1700.0,
+}
+
+# Success rate we aim for: challenging, but not frustrating
+TARGET_SUCCESS = 0.7
+
+_Q = math.log(10) / 400
+
+
+def expected_score(rating: float, game_rating: float) -> float:
+    """Probability-like expected outcome of a player at rating on a game at game_rating."""
+    return 1.0 / (1.0 + 10 ** ((game_rating - rating) / 400))
+
+
+def outcome_from_score(score: float) -> float:
+    """Map a session score on the 0-100 scale to an outcome in [0, 1]."""
+    return min(1.0, max(0.0, float(score) / 100.0))
+
+
+def inflate_rd(rd: float, days_idle: float) -> float:
+    """Increase uncertainty for the time since the last session."""
+    if days_idle <= 0:
+        return rd
+    return min(DEFAULT_RD, math.sqrt(rd ** 2 + RD_GROWTH_PER_DAY ** 2 * days_idle))
+
+
+def update_skill(rating: float, rd: float, game_rating: float, outcome: float,
+                 days_idle: float = 0.0) -> Tuple[float, float]:
+    """
+    Apply one session to a skill estimate (Glicko-1 with a fixed-rating opponent).
+    Returns: (new rating, new rating deviation)
+    """
+    rd = inflate_rd(rd, days_idle)
+    expected = expected_score(rating, game_rating)
+    d_squared = 1.0 / (_Q ** 2 * expected * (1.0 - expected))
+    precision = 1.0 / rd ** 2 + 1.0 / d_squared
+    new_rating = rating + (_Q / precision) * (outcome - expected)
+    new_rd = max(MIN_RD, math.sqrt(1.0 / precision))
+    return new_rating, new_rd
+
+
+def game_rating(difficulty: str) -> float:
+    """Rating of a difficulty label; unknown labels sit at the default rating."""
+    return DIFFICULTY_RATINGS.get(difficulty, DEFAULT_RATING)
+
+
+def level_fit(rating: float, game_rating: float) -> float:
+    """1.0 when a game's expected success equals TARGET_SUCCESS, falling towards 0."""
+    return 1.0 - abs(expected_score(rating, game_rating) - TARGET_SUCCESS)
+
+
+def is_near_level(rating: float, rd: float, game_rating: float) -> bool:
+    """Whether a game is within reach, widening the window while the estimate is uncertain."""
+    return abs(game_rating - rating) <= 200.0 + rd
@@ -0,0 +1,116 @@
+"""
+A/B experiments over recommendation strategies.
+
+Strategies are registered by name and share one signature,
+strategy(catalog, skills, focus_areas, difficulty, k) -> the top k ranked
+games (all of them when k is None), so the
+app and the offline evaluator (offline_eval) can dispatch through the same
+registry. Each strategy is registered with an explainer,
+explainer(games, skills, focus_areas) -> explanations in the format of
+recommender.explain_games, so audit records show the terms that strategy
+actually ranked by. Users are bucketed deterministically from a hash of the experiment
+name and username, so a user sees the same arm in every session and process
+without any stored assignment.
+"""
+import hashlib
+from typing import Callable, Dict, List, Mapping, Optional
+
+from recommender import FOCUS_AREA_BONUS, explain_games, matches_difficulty, rank_games
+
+BUCKETS = 10000
+
+STRATEGIES: Dict[str, Callable] = {}
+EXPLAINERS: Dict[str, Callable] = {}
+
+
+def register_strategy(name: str, explainer: Callable):
+    """Decorator adding a ranking strategy and its explainer to the registry under name."""
+    def decorator(fn: Callable) -> Callable:
+        if name in STRATEGIES:
+            raise ValueError(f"Strategy already registered: {name}")
+        STRATEGIES[name] = fn
+        EXPLAINERS[name] = explainer
+        return fn
+    return decorator
+
+
+def get_strategy(name: str) -> Callable:
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}") from None
+
+
+def get_explainer(name: str) -> Callable:
+    try:
+        return EXPLAINERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}") from None
+
+
+def explain_profile_only(games: List[Mapping], skills: Dict[str, Dict], focus_areas: List[str]) -> List[Dict]:
+    """Explain a profile_only ranking: the focus area match is the whole score."""
+    explanations = []
+    for rank, game in enumerate(games, 1):
+        match = FOCUS_AREA_BONUS if game['cognitive_focus'] in focus_areas else 0.0
+        explanations.append({'rank': rank, 'title': game['title'], 'score': match,
+                             'contributions': {'focus_area_match': match}})
+    return explanations
+
+
+@register_strategy('blended', explain_games)
+def blended(catalog, skills: Dict[str, Dict], focus_areas: List[str],
+            difficulty: Optional[str] = None, k: Optional[int] = None) -> List[Mapping]:
+    """Skill-calibrated level fit plus profile focus areas, diversity re-ranked."""
+    return rank_games(catalog.games, skills, focus_areas, difficulty, catalog.attributes, k)
+
+
+@register_strategy('profile_only', explain_profile_only)
+def profile_only(catalog, skills: Dict[str, Dict], focus_areas: List[str],
+                 difficulty: Optional[str] = None, k: Optional[int] = None) -> List[Mapping]:
+    """
+    Games training the user's chosen focus areas first. Skill estimates only
+    decide which games are near the user's level, as in blended; they do not
+    affect the order.
+    """
+    games = [game for game in catalog.games if matches_difficulty(game, skills, difficulty)]
+    return sorted(games, key=lambda game: FOCUS_AREA_BONUS if game['cognitive_focus'] in focus_areas else 0.0,
+                  reverse=True)[:k]
+
+
+def bucket(username: str, experiment: str, buckets: int = BUCKETS) -> int:
+    """Stable bucket in [0, buckets) for a user within an experiment."""
+    digest = hashlib.sha256(f"{experiment}:{username}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % buckets
+
+
+class Experiment:
+    """Split users across strategy arms by weight."""
+
+    def __init__(self, name: str, arms: Dict[str, float]):
+        for arm in arms:
+            get_strategy(arm)
+        total = sum(arms.values())
+        if total <= 0:
+            raise ValueError("Arm weights must sum to a positive number")
+        self.name = name
+        self.arms = dict(arms)
+        # Upper bucket bound of each arm, in arm order
+        self._bounds = []
+        cumulative = 0.0
+        for arm, weight in arms.items():
+            cumulative += weight
+            self._bounds.append((round(BUCKETS * cumulative / total), arm))
+
+    def assign(self, username: str) -> str:
+        """Return the arm a user is in."""
+        user_bucket = bucket(username, self.name)
+        for bound, arm in self._bounds:
+            if user_bucket < bound:
+                return arm
+        return self._bounds[-1][1]
+
+
+DEFAULT_STRATEGY = 'blended'
+
+RANKING_EXPERIMENT = Experiment('ranking-strategy-v1', {'blended': 0.5, 'profile_only': 0.5})
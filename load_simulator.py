@@ -0,0 +1,263 @@
+"""
+Concurrent-user simulator for the SQLite database behind the app.
+
+Drives DatabaseManager from several processes, each running several threads
+(one per simulated Streamlit session), with a configurable read/write mix,
+and reports throughput, write-lock wait time, latency and error rates.
+
+Usage:
+    python load_simulator.py --processes 4 --threads 8 --duration 10 --write-ratio 0.3
+    python load_simulator.py --mode both   # compare direct writes with group commit
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from db_utils import DatabaseManager
+
+SEED_USERS = 50
+
+
+class InstrumentedDatabaseManager(DatabaseManager):
+    """DatabaseManager that records how long writers wait for the write lock."""
+
+    def __init__(self, *args, **kwargs):
+        self._lock_wait_lock = threading.Lock()
+        self.lock_wait_seconds = 0.0
+        self.lock_acquisitions = 0
+        super().__init__(*args, **kwargs)
+
+    def _begin_write(self, conn: sqlite3.Connection):
+        start = time.perf_counter()
+        try:
+            super()._begin_write(conn)
+        finally:
+            waited = time.perf_counter() - start
+            with self._lock_wait_lock:
+                self.lock_wait_seconds += waited
+                self.lock_acquisitions += 1
+
+
+def sample_user_data(rng: random.Random) -> Dict:
+    """Return a random but valid signup payload."""
+    yes_no = ["Yes", "No"]
+    return {
+        "full_name": f"Sim User {rng.randint(0, 10 ** 6)}",
+        "age": rng.randint(5, 100),
+        "gender": rng.choice(["Male", "Female", "Other"]),
+        "contact_info": "",
+        "primary_caregiver": "",
+        "memory_challenge_severity": rng.randint(1, 10),
+        "focus_difficulty": rng.randint(1, 10),
+        "everyday_problems": rng.choice(yes_no),
+        "remembering_info": rng.choice(yes_no),
+        "navigation_ability": rng.randint(1, 10),
+        "language_difficulties": rng.choice(yes_no),
+        "physical_limitations": rng.choice(yes_no),
+        "physical_details": None,
+        "device_usability": rng.choice(yes_no),
+        "leisure_devices": rng.sample(["Computer", "Tablet", "Gaming Console", "Mobile"], rng.randint(1, 3)),
+        "game_preferences": "puzzles",
+        "time_spent": rng.randint(0, 5),
+        "gameplay_preference": rng.choice(["Fast-paced", "Slow-paced"]),
+        "multiplayer_interaction": rng.choice(yes_no),
+        "accommodations_needed": rng.choice(yes_no),
+        "accommodations_details": None,
+        "visual_hearing_impairments": rng.choice(yes_no),
+        "impairments_details": None,
+        "frustrating_game_mechanics": "",
+        "cognitive_focus_areas": rng.sample(["Memory", "Attention", "Problem Solving", "Language", "Spatial Skills"],
+                                            rng.randint(1, 3)),
+        "ideal_game_description": "",
+        "desired_outcomes": "",
+        "previous_experience": "No",
+        "games_tried": None,
+        "enjoyed_aspects": None,
+        "difficulties": None,
+        "game_preferences_type": rng.choice(["Single-player", "Multiplayer", "Both"]),
+        "game_values": "",
+        "progress_tracking": rng.choice(["Visual graphs", "Daily summaries", "No tracking", "Other"]),
+    }
+
+
+def seed_database(db_path: str, users: int = SEED_USERS):
+    """Create the users every worker reads and updates."""
+    db = DatabaseManager(db_path)
+    rng = random.Random(0)
+    for i in range(users):
+        db.create_user(f"seed_{i}", "password", sample_user_data(rng))
+
+
+def _session_loop(db: DatabaseManager, config: Dict, worker_id: str, stats: Dict, stats_lock: threading.Lock):
+    """Simulate one session issuing a read/write mix until the deadline."""
+    rng = random.Random(worker_id)
+    deadline = time.monotonic() + config["duration"]
+    counter = 0
+    while time.monotonic() < deadline:
+        seed_user = f"seed_{rng.randrange(config['seed_users'])}"
+        is_write = rng.random() < config["write_ratio"]
+        start = time.perf_counter()
+        if not is_write:
+            op = "read"
+            if rng.random() < 0.5:
+                db.get_user_data(seed_user)
+            else:
+                db.verify_user(seed_user, "password")
+            success, message = True, ""
+        elif rng.random() < config["create_ratio"]:
+            op = "create"
+            counter += 1
+            success, message = db.create_user(f"sim_{worker_id}_{counter}", "password", sample_user_data(rng))
+        else:
+            op = "update"
+            success, message = db.update_user_preferences(
+                seed_user, {"memory_challenge_severity": rng.randint(1, 10), "time_spent": rng.randint(0, 5)})
+        elapsed = time.perf_counter() - start
+
+        with stats_lock:
+            stats["latencies"].setdefault(op, []).append(elapsed)
+            stats["ops"] += 1
+            if not success:
+                stats["errors"] += 1
+                if "locked" in message or "busy" in message:
+                    stats["lock_errors"] += 1
+
+
+def _run_process(config: Dict, process_index: int) -> Dict:
+    """Run config['threads'] sessions in this process and return raw stats."""
+    db = InstrumentedDatabaseManager(config["db_path"], serialize_writes=config["serialize_writes"],
+                                     busy_timeout=config["busy_timeout"])
+    stats = {"ops": 0, "errors": 0, "lock_errors": 0, "latencies": {}}
+    stats_lock = threading.Lock()
+    threads = [
+        threading.Thread(target=_session_loop,
+                         args=(db, config, f"{process_index}_{t}", stats, stats_lock))
+        for t in range(config["threads"])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    db.close()
+
+    stats["lock_wait_seconds"] = db.lock_wait_seconds
+    stats["lock_acquisitions"] = db.lock_acquisitions
+    return stats
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def run_simulation(db_path: str, processes: int = 4, threads: int = 8, duration: float = 10.0,
+                   write_ratio: float = 0.3, create_ratio: float = 0.5, serialize_writes: bool = False,
+                   busy_timeout: float = 5.0, seed_users: int = SEED_USERS) -> Dict:
+    """
+    Run one simulation against db_path and return the aggregated report.
+    The database is seeded with seed_users accounts first if they do not exist.
+    """
+    seed_database(db_path, seed_users)
+    config = {
+        "db_path": db_path,
+        "threads": threads,
+        "duration": duration,
+        "write_ratio": write_ratio,
+        "create_ratio": create_ratio,
+        "serialize_writes": serialize_writes,
+        "busy_timeout": busy_timeout,
+        "seed_users": seed_users,
+    }
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(_run_process, [config] * processes, range(processes)))
+    wall = time.perf_counter() - wall_start
+
+    ops = sum(r["ops"] for r in results)
+    errors = sum(r["errors"] for r in results)
+    latencies: Dict[str, List[float]] = {}
+    for r in results:
+        for op, values in r["latencies"].items():
+            latencies.setdefault(op, []).extend(values)
+    lock_acquisitions = sum(r["lock_acquisitions"] for r in results)
+    lock_wait = sum(r["lock_wait_seconds"] for r in results)
+
+    return {
+        "mode": "group-commit" if serialize_writes else "direct",
+        "processes": processes,
+        "threads_per_process": threads,
+        "write_ratio": write_ratio,
+        "ops": ops,
+        "throughput_ops_per_s": ops / wall if wall else 0.0,
+        "error_rate": errors / ops if ops else 0.0,
+        "lock_error_rate": sum(r["lock_errors"] for r in results) / ops if ops else 0.0,
+        "lock_wait_total_s": lock_wait,
+        "lock_wait_mean_ms": 1000 * lock_wait / lock_acquisitions if lock_acquisitions else 0.0,
+        "write_transactions": lock_acquisitions,
+        "latency_ms": {
+            op: {
+                "count": len(values),
+                "p50": 1000 * _percentile(values, 50),
+                "p95": 1000 * _percentile(values, 95),
+                "p99": 1000 * _percentile(values, 99),
+            }
+            for op, values in sorted(latencies.items())
+        },
+    }
+
+
+def print_report(report: Dict):
+    print(f"== {report['mode']}: {report['processes']} processes x {report['threads_per_process']} threads, "
+          f"write ratio {report['write_ratio']:.0%}")
+    print(f"   throughput        {report['throughput_ops_per_s']:10.1f} ops/s ({report['ops']} ops)")
+    print(f"   error rate        {report['error_rate']:10.2%}  (lock errors {report['lock_error_rate']:.2%})")
+    print(f"   write lock wait   {report['lock_wait_mean_ms']:10.2f} ms mean over "
+          f"{report['write_transactions']} write transactions")
+    for op, lat in report["latency_ms"].items():
+        print(f"   {op:<8} p50 {lat['p50']:8.2f} ms  p95 {lat['p95']:8.2f} ms  p99 {lat['p99']:8.2f} ms  "
+              f"(n={lat['count']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--db", help="database file (default: a fresh temporary file per mode)")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8, help="sessions per process")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="fraction of operations that write")
+    parser.add_argument("--create-ratio", type=float, default=0.5,
+                        help="fraction of writes that are create_user (the rest update preferences)")
+    parser.add_argument("--busy-timeout", type=float, default=5.0)
+    parser.add_argument("--mode", choices=["direct", "group-commit", "both"], default="both")
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args()
+
+    modes = ["direct", "group-commit"] if args.mode == "both" else [args.mode]
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            db_path = args.db or os.path.join(tmp, f"{mode}.db")
+            reports.append(run_simulation(
+                db_path, processes=args.processes, threads=args.threads, duration=args.duration,
+                write_ratio=args.write_ratio, create_ratio=args.create_ratio,
+                serialize_writes=(mode == "group-commit"), busy_timeout=args.busy_timeout))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Offline replay evaluation of recommendation strategies.
+
+Replays historical game_sessions in play order. Before each session, every
+strategy ranks the catalog from what was known at that moment: the user's
+profile and the skill estimates rebuilt from their earlier sessions with the
+same O(1) update used in production. The game actually played is the
+relevant item, and precision@k, hit rate@k and NDCG@k are averaged per
+strategy.
+
+Users are split into contiguous user_id ranges that a process pool works
+through. Each task streams its range from the (user_id, id) index over its
+own connection, so sessions are never loaded all at once.
+
+Usage:
+    python offline_eval.py --db game_helper.db --k 5 --workers 4
+"""
+import argparse
+import json
+import math
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from catalog import DEFAULT_CATALOG_PATH, CatalogSnapshot, load_catalog
+from difficulty import DEFAULT_RATING, DEFAULT_RD, game_rating, outcome_from_score, update_skill
+from experiments import STRATEGIES, get_strategy
+
+_SESSIONS_QUERY = '''
+    SELECT gs.user_id, gs.game_name, gs.score, gs.difficulty, gs.cognitive_focus, gs.played_at,
+           up.cognitive_focus_areas
+    FROM game_sessions gs
+    LEFT JOIN user_preferences up ON up.user_id = gs.user_id
+    WHERE gs.user_id BETWEEN ? AND ?
+    ORDER BY gs.user_id, gs.id
+'''
+
+_catalog: Optional[CatalogSnapshot] = None
+
+
+def _init_worker(catalog_path: str):
+    global _catalog
+    games, version = load_catalog(catalog_path)
+    _catalog = CatalogSnapshot(games, version=version)
+
+
+def _focus_areas(value) -> List[str]:
+    try:
+        parsed = json.loads(value) if value else []
+    except json.JSONDecodeError:
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _empty_totals() -> Dict[str, float]:
+    return {'sessions': 0, 'precision': 0.0, 'hits': 0, 'ndcg': 0.0}
+
+
+def _evaluate_range(db_path: str, low: int, high: int, strategies: Sequence[str],
+                    k: int) -> Dict[str, Dict[str, float]]:
+    """Replay the sessions of users low..high and return metric sums per strategy."""
+    ranked_by = {name: get_strategy(name) for name in strategies}
+    totals = {name: _empty_totals() for name in strategies}
+
+    conn = sqlite3.connect(db_path)
+    try:
+        current_user = None
+        skills: Dict[str, Dict] = {}
+        for user_id, game_name, score, difficulty, cognitive_focus, played_at, focus_json in conn.execute(
+                _SESSIONS_QUERY, (low, high)):
+            if user_id != current_user:
+                current_user = user_id
+                skills = {}
+                focus_areas = _focus_areas(focus_json)
+
+            for name, strategy in ranked_by.items():
+                titles = [game['title'] for game in strategy(_catalog, skills, focus_areas, None, k)]
+                metrics = totals[name]
+                metrics['sessions'] += 1
+                if game_name in titles:
+                    rank = titles.index(game_name) + 1
+                    metrics['hits'] += 1
+                    metrics['precision'] += 1.0 / k
+                    # Single relevant item, so the ideal DCG is 1
+                    metrics['ndcg'] += 1.0 / math.log2(rank + 1)
+
+            if cognitive_focus and difficulty and score is not None:
+                played = datetime.fromisoformat(played_at) if played_at else None
+                skill = skills.get(cognitive_focus, {'rating': DEFAULT_RATING, 'rd': DEFAULT_RD, 'sessions': 0,
+                                                     'played_at': played})
+                days_idle = ((played - skill['played_at']).total_seconds() / 86400
+                             if played and skill['played_at'] else 0.0)
+                rating, rd = update_skill(skill['rating'], skill['rd'], game_rating(difficulty),
+                                          outcome_from_score(score), days_idle)
+                skills[cognitive_focus] = {'rating': rating, 'rd': rd, 'sessions': skill['sessions'] + 1,
+                                           'played_at': played}
+    finally:
+        conn.close()
+    return totals
+
+
+def user_ranges(db_path: str, parts: int) -> List[Tuple[int, int]]:
+    """Split the user_id span of game_sessions into up to parts contiguous ranges."""
+    conn = sqlite3.connect(db_path)
+    try:
+        low, high = conn.execute('SELECT MIN(user_id), MAX(user_id) FROM game_sessions').fetchone()
+    finally:
+        conn.close()
+    if low is None:
+        return []
+    step = max(1, math.ceil((high - low + 1) / parts))
+    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+
+def evaluate(db_path: str, strategies: Optional[Sequence[str]] = None, k: int = 5, workers: int = 4,
+             catalog_path: str = DEFAULT_CATALOG_PATH) -> Dict[str, Dict[str, float]]:
+    """
+    Replay all sessions and compare strategies.
+    Returns: {strategy: {'sessions', 'precision@k', 'hit_rate@k', 'ndcg@k'}}
+    """
+    strategies = list(strategies or STRATEGIES)
+    for name in strategies:
+        get_strategy(name)
+    # More ranges than workers evens out users with long histories
+    ranges = user_ranges(db_path, workers * 4)
+
+    totals = {name: _empty_totals() for name in strategies}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(catalog_path,)) as pool:
+        futures = [pool.submit(_evaluate_range, db_path, low, high, strategies, k) for low, high in ranges]
+        for future in futures:
+            for name, partial in future.result().items():
+                for metric, value in partial.items():
+                    totals[name][metric] += value
+
+    report = {}
+    for name, metrics in totals.items():
+        sessions = metrics['sessions']
+        report[name] = {
+            'sessions': sessions,
+            f'precision@{k}': metrics['precision'] / sessions if sessions else 0.0,
+            f'hit_rate@{k}': metrics['hits'] / sessions if sessions else 0.0,
+            f'ndcg@{k}': metrics['ndcg'] / sessions if sessions else 0.0,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--db', default='game_helper.db')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG_PATH)
+    parser.add_argument('--strategies', nargs='+', choices=sorted(STRATEGIES), help='default: all registered')
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    report = evaluate(args.db, args.strategies, k=args.k, workers=args.workers, catalog_path=args.catalog)
+    for name, metrics in report.items():
+        print(f"{name:<14} " + '  '.join(
+            f'{metric} {value:.4f}' if isinstance(value, float) else f'{metric} {value}'
+            for metric, value in metrics.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Startup profile for streamlit_app.
+
+Runs every measurement in a fresh interpreter so nothing is already cached:
+
+1. `python -X importtime -c "import streamlit_app"`: the slowest imports by
+   cumulative time, showing what the app pays for at import time.
+2. Time to first render: a cold process renders the login page once through
+   streamlit.testing (the same script run a new worker does for its first
+   session), followed by a rerun that reuses the cached resources.
+
+Exits non-zero when time to first render misses the target, so it can
+guard startup regressions.
+
+Usage:
+    python profile_startup.py [--top 15] [--target-ms 1500]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_SCRIPT = os.path.join(APP_DIR, 'streamlit_app.py')
+
+# Cold process, from interpreter start to the first rendered login page
+TARGET_FIRST_RENDER_MS = 1500
+
+_RENDER_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+imported_streamlit = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+at.run()
+first_render = time.perf_counter()
+at.run()
+rerun = time.perf_counter()
+print(json.dumps({
+    "import_streamlit_ms": 1000 * (imported_streamlit - start),
+    "first_render_ms": 1000 * (first_render - start),
+    "first_script_run_ms": 1000 * (first_render - imported_streamlit),
+    "rerun_ms": 1000 * (rerun - first_render),
+    "exceptions": [str(e.value) for e in at.exception],
+}))
+'''
+
+
+def import_times(cwd: str) -> Tuple[int, List[Tuple[int, int, str]]]:
+    """
+    Import streamlit_app under -X importtime.
+    Returns: (total us, [(self us, cumulative us, module)] for its direct imports)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import streamlit_app'],
+        cwd=cwd, env={**os.environ, 'PYTHONPATH': APP_DIR}, capture_output=True, text=True, check=True)
+    children: List[Tuple[int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Lines are printed when an import finishes, children first; each
+        # nesting level adds two spaces of indentation after the first one.
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        if level == 1:
+            children.append((int(self_us), int(cumulative_us), name.strip()))
+        elif level == 0:
+            if name.strip() == 'streamlit_app':
+                return int(cumulative_us), children
+            children = []
+    return 0, children
+
+
+def render_times(cwd: str) -> Dict:
+    result = subprocess.run(
+        [sys.executable, '-c', _RENDER_PROBE, APP_SCRIPT],
+        cwd=cwd, env={**os.environ, 'PYTHONPATH': APP_DIR}, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--top', type=int, default=15, help='number of imports to list')
+    parser.add_argument('--target-ms', type=float, default=TARGET_FIRST_RENDER_MS)
+    args = parser.parse_args()
+
+    # Run from a scratch directory so the probe creates its own database file
+    with tempfile.TemporaryDirectory() as cwd:
+        total_us, imports = import_times(cwd)
+        render = render_times(cwd)
+
+    print(f'import streamlit_app: {total_us / 1000:.1f} ms')
+    for self_us, cumulative_us, name in sorted(imports, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f'  {cumulative_us / 1000:9.1f} ms cumulative  {self_us / 1000:7.1f} ms self  {name}')
+
+    print()
+    print(f"import streamlit      {render['import_streamlit_ms']:9.1f} ms")
+    print(f"first script run      {render['first_script_run_ms']:9.1f} ms")
+    print(f"time to first render  {render['first_render_ms']:9.1f} ms  (target {args.target_ms:.0f} ms)")
+    print(f"rerun                 {render['rerun_ms']:9.1f} ms")
+    for message in render['exceptions']:
+        print(f'app raised: {message}')
+
+    if render['exceptions'] or render['first_render_ms'] > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
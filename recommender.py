@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from difficulty import DEFAULT_RATING, DEFAULT_RD, expected_score, game_rating, is_near_level, level_fit
+from reranking import diversify
+
+# Added to the level fit of games that train one of the user's chosen areas
+FOCUS_AREA_BONUS = 0.5
+
+
+def user_level(skills: Dict[str, Dict], cognitive_area: str):
+    """Return (rating, rd) for an area, falling back to the prior for new areas."""
+    skill = skills.get(cognitive_area)
+    if not skill:
+        return DEFAULT_RATING, DEFAULT_RD
+    return skill['rating'], skill['rd']
+
+
+def matches_difficulty(game: Dict, skills: Dict[str, Dict], difficulty: Optional[str] = None) -> bool:
+    """
+    Whether a game passes the difficulty filter: an explicit difficulty label,
+    or with difficulty=None, being near the user's level in the game's area.
+    """
+    if difficulty is not None:
+        return game['difficulty'] == difficulty
+    rating, rd = user_level(skills, game['cognitive_focus'])
+    return is_near_level(rating, rd, game_rating(game['difficulty']))
+
+
+def score_game(game: Dict, skills: Dict[str, Dict], focus_areas: List[str]) -> Tuple[float, Dict]:
+    """
+    Score one game for a user.
+    Returns: (score, contributions) where contributions holds each additive
+    term of the score and the profile inputs behind it
+    """
+    rating, rd = user_level(skills, game['cognitive_focus'])
+    target = game_rating(game['difficulty'])
+    contributions = {
+        'level_fit': level_fit(rating, target),
+        'focus_area_match': FOCUS_AREA_BONUS if game['cognitive_focus'] in focus_areas else 0.0,
+        'skill_rating': rating,
+        'skill_rd': rd,
+        'game_rating': target,
+        'expected_success': expected_score(rating, target),
+    }
+    return contributions['level_fit'] + contributions['focus_area_match'], contributions
+
+
+def explain_games(games: List[Dict], skills: Dict[str, Dict], focus_areas: List[str]) -> List[Dict]:
+    """Explain the score of each game in a ranked list, keeping its order."""
+    explanations = []
+    for rank, game in enumerate(games, 1):
+        score, contributions = score_game(game, skills, focus_areas)
+        explanations.append({'rank': rank, 'title': game['title'], 'score': score,
+                             'contributions': contributions})
+    return explanations
+
+
+def rank_games(games: Sequence[Dict], skills: Dict[str, Dict], focus_areas: List[str],
+               difficulty: Optional[str] = None, attributes: Optional[np.ndarray] = None,
+               k: Optional[int] = None) -> List[Dict]:
+    """
+    Filter and rank games for a user.
+
+    With difficulty=None, games are kept when they are near the user's skill
+    estimate for the game's cognitive area and ranked by how close their
+    expected success is to the target. An explicit difficulty keeps only games
+    of that difficulty. Games training one of focus_areas rank higher. The
+    scored list is then re-ranked for diversity across focus area, platform
+    and difficulty (see reranking), reusing precomputed attribute codes
+    aligned with games (e.g. CatalogSnapshot.attributes) when given. Pass k
+    when only the top k games are used, so MMR selects k games instead of the
+    whole candidate cap.
+    """
+    scored = []
+    for i, game in enumerate(games):
+        if not matches_difficulty(game, skills, difficulty):
+            continue
+        score, _ = score_game(game, skills, focus_areas)
+        scored.append((score, i))
+    kept = [i for _, i in scored]
+    return diversify([games[i] for i in kept], [score for score, _ in scored], k=k,
+                     attributes=None if attributes is None else attributes[kept])
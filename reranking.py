@@ -0,0 +1,112 @@
+"""
+Diversity-aware re-ranking of scored candidates.
+
+Maximal Marginal Relevance over categorical game attributes: each step
+picks the candidate with the best trade-off between its relevance and its
+similarity to what has already been picked. Similarity is the weighted
+share of attributes (cognitive focus, platform, difficulty) two games have
+in common. Only the top candidate_cap candidates by relevance are
+considered, and the running max-similarity is updated incrementally, so
+re-ranking k results costs O(N + k*C) instead of O(N^2).
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+DIVERSITY_ATTRIBUTES = ('cognitive_focus', 'platform', 'difficulty')
+DEFAULT_ATTRIBUTE_WEIGHTS = (0.6, 0.2, 0.2)
+
+
+def encode_attributes(games: Sequence[Dict], attributes: Sequence[str] = DIVERSITY_ATTRIBUTES) -> np.ndarray:
+    """Integer-code categorical attributes into an (n_games, n_attributes) array."""
+    codes = np.empty((len(games), len(attributes)), dtype=np.int32)
+    for column, attribute in enumerate(attributes):
+        vocabulary: Dict = {}
+        for row, game in enumerate(games):
+            codes[row, column] = vocabulary.setdefault(game.get(attribute), len(vocabulary))
+    return codes
+
+
+def mmr_rerank(relevance: np.ndarray, attributes: np.ndarray, k: int, diversity: float = 0.3,
+               candidate_cap: int = 200, weights: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    Select k candidates by Maximal Marginal Relevance.
+
+    Args:
+        relevance: (N,) candidate scores, higher is better.
+        attributes: (N, A) integer attribute codes from encode_attributes.
+        k: number of results to return.
+        diversity: weight of the redundancy penalty, 0 keeps relevance order.
+        candidate_cap: only the top-C candidates by relevance are re-ranked.
+        weights: (A,) attribute weights summing to 1; DEFAULT_ATTRIBUTE_WEIGHTS by default.
+
+    Returns:
+        Indices into relevance, in re-ranked order.
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    n = relevance.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if weights is None:
+        weights = DEFAULT_ATTRIBUTE_WEIGHTS[:attributes.shape[1]]
+    weights = np.asarray(weights, dtype=np.float64)
+
+    cap = min(n, max(candidate_cap, k))
+    if cap < n:
+        candidates = np.argpartition(-relevance, cap - 1)[:cap]
+    else:
+        candidates = np.arange(n)
+    candidates = candidates[np.argsort(-relevance[candidates], kind='stable')]
+
+    rel = relevance[candidates]
+    spread = rel[0] - rel[-1]
+    rel = (rel - rel[-1]) / spread if spread > 0 else np.ones_like(rel)
+    attrs = attributes[candidates]
+
+    max_sim = np.zeros(cap)
+    available = np.ones(cap, dtype=bool)
+    selected = np.empty(k, dtype=np.int64)
+    for step in range(k):
+        mmr = (1.0 - diversity) * rel - diversity * max_sim
+        mmr[~available] = -np.inf
+        pick = int(np.argmax(mmr))
+        selected[step] = pick
+        available[pick] = False
+        np.maximum(max_sim, (attrs == attrs[pick]) @ weights, out=max_sim)
+    return candidates[selected]
+
+
+def focus_coverage(games: Sequence[Dict], focus_areas: Sequence[str]) -> float:
+    """Share of the user's chosen focus areas trained by at least one of games."""
+    if not focus_areas:
+        return 1.0
+    covered = {game.get('cognitive_focus') for game in games}
+    return len(covered.intersection(focus_areas)) / len(set(focus_areas))
+
+
+def attribute_coverage(games: Sequence[Dict], attributes: Sequence[str] = DIVERSITY_ATTRIBUTES) -> Dict[str, int]:
+    """Number of distinct values of each attribute among games."""
+    return {attribute: len({game.get(attribute) for game in games}) for attribute in attributes}
+
+
+def diversify(games: List[Dict], scores: Sequence[float], k: Optional[int] = None,
+              diversity: float = 0.3, candidate_cap: int = 200,
+              attributes: Optional[np.ndarray] = None) -> List[Dict]:
+    """
+    Re-rank scored games with MMR; games beyond the candidate cap keep their score order.
+    attributes: precomputed encode_attributes rows for games, encoded here if omitted.
+    """
+    if not games:
+        return []
+    scores = np.asarray(scores, dtype=np.float64)
+    k = len(games) if k is None else k
+    if attributes is None:
+        attributes = encode_attributes(games)
+    order = mmr_rerank(scores, attributes, min(k, candidate_cap), diversity, candidate_cap)
+    result = [games[i] for i in order]
+    if len(result) < k:
+        chosen = set(order.tolist())
+        rest = [i for i in np.argsort(-scores, kind='stable') if i not in chosen]
+        result.extend(games[i] for i in rest[:k - len(result)])
+    return result
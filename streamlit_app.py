@@ -1,11 +1,31 @@
 import streamlit as st
-from db_utils import DatabaseManager
 import json
-from datetime import datetime
 import random
 
-# Initialize database manager
-db = DatabaseManager()
+# Streamlit re-executes this script on every interaction, so nothing heavy
+# may run at module level: shared resources are built on first use through
+# st.cache_resource (once per process, shared by all sessions), and modules
+# only some pages need are imported inside the functions that use them.
+
+@st.cache_resource
+def get_db():
+    """Return the process-wide DatabaseManager, running schema setup once."""
+    from db_utils import DatabaseManager
+    return DatabaseManager()
+
+@st.cache_resource
+def get_catalog():
+    """Return the process-wide CatalogLoader; it reloads the catalog file in the background."""
+    from catalog import CatalogLoader
+    return CatalogLoader()
+
+@st.cache_resource
+def get_audit_logger():
+    """Return the process-wide AuditLogger for recommendation explanations."""
+    from audit_log import AuditLogger
+    return AuditLogger(get_db().get_db_connection)
+
+AUTO_DIFFICULTY = "Matched to my level"
 
 def accessible_ui_styles():
     st.markdown("""
@@ -92,35 +112,76 @@ def display_game_card(game):
     </div>
     """, unsafe_allow_html=True)
 
-def get_game_recommendations(user_preferences):
-    # Sample game database - in production, this would come from a real database
-    sample_games = [
-        {
-            "title": "Memory Match",
-            "difficulty": "Easy",
-            "platform": "Web",
-            "cognitive_focus": "Memory",
-            "description": "A classic memory matching game with customizable difficulty levels."
-        },
-        {
-            "title": "Word Adventure",
-            "difficulty": "Medium",
-            "platform": "Mobile",
-            "cognitive_focus": "Language",
-            "description": "Interactive word-finding game that helps improve vocabulary and language skills."
+def get_ranking_arm(username):
+    """Return the ranking strategy the user is assigned to in the running experiment."""
+    from experiments import RANKING_EXPERIMENT
+    return RANKING_EXPERIMENT.assign(username)
+
+def get_game_recommendations(user_preferences, skills=None, difficulty=None, strategy=None, catalog=None,
+                             k=None):
+    """
+    Rank catalog games for a user.
+
+    Args:
+        user_preferences (dict): User data as returned by DatabaseManager.get_user_data.
+        skills (dict, optional): Skill estimates from DatabaseManager.get_user_skills.
+        difficulty (str, optional): Only return games of this difficulty; by default
+            games are matched to the user's estimated level.
+        strategy (str, optional): Name of a registered ranking strategy (see
+            experiments); defaults to experiments.DEFAULT_STRATEGY.
+        catalog (CatalogSnapshot, optional): Snapshot to rank; defaults to the
+            current one. Pass the snapshot taken for the page so its version
+            can be logged with the results.
+        k (int, optional): Number of games needed; pass it when the list is
+            truncated so only k games are re-ranked. Defaults to all.
+
+    Returns:
+        List of game dicts, best match first
+    """
+    from experiments import DEFAULT_STRATEGY, get_strategy
+
+    catalog = catalog or get_catalog().current()
+    focus_areas = safe_json_loads(user_preferences.get('cognitive_focus_areas', '[]'))
+    return get_strategy(strategy or DEFAULT_STRATEGY)(catalog, skills or {}, focus_areas, difficulty, k)
+
+def log_recommendations(username, page, games, skills, user_preferences, filters=None, arm=None,
+                        catalog_version=None, difficulty=None):
+    """
+    Record which games were shown, the filters applied and the profile features
+    behind each score, plus an exposure event for the user's experiment arm.
+    Scores are explained by the explainer of the strategy that ranked the games,
+    and catalog_version should be the version of the snapshot they came from.
+    difficulty is the difficulty the games were ranked with; None means they
+    were matched to the user's level.
+    Only enqueues, so it adds no database latency to the page.
+    """
+    from experiments import DEFAULT_STRATEGY, RANKING_EXPERIMENT, get_explainer
+
+    audit_log = get_audit_logger()
+    if arm is not None:
+        audit_log.log('exposure', username, {
+            'experiment': RANKING_EXPERIMENT.name,
+            'arm': arm,
+            'page': page,
+            'catalog_version': catalog_version,
+            'difficulty_filter': difficulty or 'near_level',
+            'titles': [game['title'] for game in games],
+        })
+
+    focus_areas = safe_json_loads(user_preferences.get('cognitive_focus_areas', '[]'))
+    audit_log.log('recommendation', username, {
+        'page': page,
+        'strategy': arm,
+        'filters': filters or {},
+        'profile': {
+            'cognitive_focus_areas': focus_areas,
+            'leisure_devices': safe_json_loads(user_preferences.get('leisure_devices', '[]')),
         },
-        {
-            "title": "Pattern Master",
-            "difficulty": "Hard",
-            "platform": "PC",
-            "cognitive_focus": "Problem Solving",
-            "description": "Complex pattern recognition game with progressive difficulty levels."
-        }
-    ]
-    return sample_games
+        'recommendations': get_explainer(arm or DEFAULT_STRATEGY)(games, skills, focus_areas),
+    })
 
 def profile_page(username):
-    user_data = db.get_user_data(username)
+    user_data = get_db().get_user_data(username)
     if user_data:
         st.markdown("### My Profile")
 
@@ -176,7 +237,7 @@ def profile_page(username):
             st.write(f"**Game Type:** {user_data['game_preferences_type']}")
 
 def game_recommendations_page(username):
-    user_data = db.get_user_data(username)
+    user_data = get_db().get_user_data(username)
     if user_data:
         st.markdown("### Game Recommendations")
 
@@ -184,7 +245,7 @@ def game_recommendations_page(username):
         st.markdown("#### Customize Your Recommendations")
         cols = st.columns(3)
         with cols[0]:
-            difficulty = st.selectbox("Difficulty Level", ["Easy", "Medium", "Hard"])
+            difficulty = st.selectbox("Difficulty Level", [AUTO_DIFFICULTY, "Easy", "Medium", "Hard"])
         with cols[1]:
             platform = st.selectbox("Platform", ["All"] + safe_json_loads(user_data.get('leisure_devices', '[]')))
         with cols[2]:
@@ -195,7 +256,11 @@ def game_recommendations_page(username):
             )
 
         # Get and display recommendations
-        games = get_game_recommendations(user_data)
+        skills = get_db().get_user_skills(username)
+        arm = get_ranking_arm(username)
+        catalog = get_catalog().current()
+        ranking_difficulty = None if difficulty == AUTO_DIFFICULTY else difficulty
+        games = get_game_recommendations(user_data, skills, ranking_difficulty, arm, catalog)
 
         # Filter games based on user selection
         if platform != "All":
@@ -203,6 +268,10 @@ def game_recommendations_page(username):
         if cognitive_focus != "All":
             games = [g for g in games if g['cognitive_focus'] == cognitive_focus]
 
+        log_recommendations(username, "Game Recommendations", games, skills, user_data, {
+            "difficulty": difficulty, "platform": platform, "cognitive_focus": cognitive_focus},
+            arm, catalog.version, ranking_difficulty)
+
         # Display games
         if games:
             for game in games:
@@ -226,7 +295,7 @@ def login_signup_page():
         
         if st.button("Login", help="Click to log into your account"):
             if login_username and login_password:
-                if db.verify_user(login_username, login_password):
+                if get_db().verify_user(login_username, login_password):
                     st.session_state["logged_in"] = True
                     st.session_state["username"] = login_username
                     st.success("Logged in successfully!")
@@ -344,7 +413,7 @@ def login_signup_page():
                     "progress_tracking": progress_tracking
                 }
                 
-                success, message = db.create_user(username, password, user_data)
+                success, message = get_db().create_user(username, password, user_data)
                 if success:
                     st.success(message)
                     st.info("Please proceed to login with your new account.")
@@ -352,7 +421,7 @@ def login_signup_page():
                     st.error(message)
 
 def profile_page(username):
-    user_data = db.get_user_data(username)
+    user_data = get_db().get_user_data(username)
     if user_data:
         st.markdown("### My Profile")
         
@@ -404,7 +473,7 @@ def profile_page(username):
             st.write(f"**Game Type:** {user_data['game_preferences_type']}")
 
 def game_recommendations_page(username):
-    user_data = db.get_user_data(username)
+    user_data = get_db().get_user_data(username)
     if user_data:
         st.markdown("### Game Recommendations")
         
@@ -412,7 +481,7 @@ def game_recommendations_page(username):
         st.markdown("#### Customize Your Recommendations")
         cols = st.columns(3)
         with cols[0]:
-            difficulty = st.selectbox("Difficulty Level", ["Easy", "Medium", "Hard"])
+            difficulty = st.selectbox("Difficulty Level", [AUTO_DIFFICULTY, "Easy", "Medium", "Hard"])
         with cols[1]:
             platform = st.selectbox("Platform", ["All"] + user_data['leisure_devices'])
 
@@ -421,7 +490,11 @@ def game_recommendations_page(username):
                                          ["All"] + safe_json_loads(user_data['cognitive_focus_areas']))
         
         # Get and display recommendations
-        games = get_game_recommendations(user_data)
+        skills = get_db().get_user_skills(username)
+        arm = get_ranking_arm(username)
+        catalog = get_catalog().current()
+        ranking_difficulty = None if difficulty == AUTO_DIFFICULTY else difficulty
+        games = get_game_recommendations(user_data, skills, ranking_difficulty, arm, catalog)
         
         # Filter games based on user selection
         if platform != "All":
@@ -429,6 +502,10 @@ def game_recommendations_page(username):
         if cognitive_focus != "All":
             games = [g for g in games if g['cognitive_focus'] == cognitive_focus]
         
+        log_recommendations(username, "Game Recommendations", games, skills, user_data, {
+            "difficulty": difficulty, "platform": platform, "cognitive_focus": cognitive_focus},
+            arm, catalog.version, ranking_difficulty)
+
         # Display games
         if games:
             for game in games:
@@ -481,7 +558,13 @@ def main():
             
             # Daily recommendations
             st.markdown("### Today's Recommended Games")
-            games = get_game_recommendations({})[:2]  # Get top 2 games
+            username = st.session_state['username']
+            user_data = get_db().get_user_data(username) or {}
+            skills = get_db().get_user_skills(username)
+            arm = get_ranking_arm(username)
+            catalog = get_catalog().current()
+            games = get_game_recommendations(user_data, skills, strategy=arm, catalog=catalog, k=2)  # Get top 2 games
+            log_recommendations(username, "Home", games, skills, user_data, arm=arm, catalog_version=catalog.version)
             for game in games:
                 display_game_card(game)
                 
@@ -512,62 +595,34 @@ def main():
 
 def update_user_progress(username, game_data):
     """Update user's gaming progress and statistics"""
-    try:
-        # Get current user data
-        user_data = db.get_user_data(username)
-        
-        # Update progress
-        if 'progress' not in user_data:
-            user_data['progress'] = []
-        
-        # Add new progress entry
-        progress_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'game': game_data['game_name'],
-            'score': game_data['score'],
-            'duration': game_data['duration'],
-            'difficulty': game_data['difficulty']
-        }
-        user_data['progress'].append(progress_entry)
-        
-        # Update user statistics
-        if 'statistics' not in user_data:
-            user_data['statistics'] = {
-                'total_games_played': 0,
-                'total_time_played': 0,
-                'average_score': 0,
-                'favorite_games': {}
-            }
-        
-        stats = user_data['statistics']
-        stats['total_games_played'] += 1
-        stats['total_time_played'] += game_data['duration']
-        
-        # Update favorite games
-        if game_data['game_name'] in stats['favorite_games']:
-            stats['favorite_games'][game_data['game_name']] += 1
-        else:
-            stats['favorite_games'][game_data['game_name']] = 1
-        
-        # Save updated user data
-        db.update_user_data(username, user_data)
-        return True, "Progress updated successfully"
-    except Exception as e:
-        return False, f"Error updating progress: {str(e)}"
+    game = get_catalog().current().find(game_data['game_name'])
+    return get_db().record_game_session(username, {
+        'game_name': game_data['game_name'],
+        'score': game_data['score'],
+        'duration': game_data['duration'],
+        'difficulty': game_data['difficulty'],
+        'cognitive_focus': game_data.get('cognitive_focus') or (game['cognitive_focus'] if game else None)
+    })
 
 def generate_progress_report(username):
     """Generate a detailed progress report for the user"""
-    user_data = db.get_user_data(username)
-    if not user_data or 'progress' not in user_data:
+    progress = get_db().get_game_sessions(username)
+    if not progress:
         return None
     
+    favorite_games = {}
+    for p in progress:
+        favorite_games[p['game_name']] = favorite_games.get(p['game_name'], 0) + 1
+    
+    # Sessions may be recorded without a score or duration
+    scores = [p['score'] for p in progress if p['score'] is not None]
     report = {
-        'games_played': len(user_data['progress']),
-        'total_time': sum(p['duration'] for p in user_data['progress']),
-        'average_score': sum(p['score'] for p in user_data['progress']) / len(user_data['progress']),
-        'favorite_games': user_data['statistics']['favorite_games'],
-        'recent_progress': user_data['progress'][-5:],  # Last 5 games
-        'cognitive_improvement': calculate_cognitive_improvement(user_data['progress'])
+        'games_played': len(progress),
+        'total_time': sum(p['duration'] for p in progress if p['duration'] is not None),
+        'average_score': sum(scores) / len(scores) if scores else None,
+        'favorite_games': favorite_games,
+        'recent_progress': progress[-5:],  # Last 5 games
+        'cognitive_improvement': calculate_cognitive_improvement(progress)
     }
     return report
 
@@ -0,0 +1,64 @@
+import os
+import random
+import sqlite3
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from analytics_export import export_analytics
+from db_utils import DatabaseManager
+from load_simulator import sample_user_data
+
+
+def add_user(db, rng, username):
+    assert db.create_user(username, 'secret', sample_user_data(rng))[0]
+    assert db.record_game_session(username, {'game_name': 'Memory Match', 'score': 80, 'duration': 10,
+                                             'difficulty': 'Easy', 'cognitive_focus': 'Memory'})[0]
+
+
+def exported_rows(out_dir, table):
+    return pq.read_table(os.path.join(out_dir, table)).num_rows
+
+
+def test_incremental_full_incremental_has_no_duplicates(tmp_path):
+    db_path = str(tmp_path / 'game_helper.db')
+    out_dir = str(tmp_path / 'out')
+    db = DatabaseManager(db_path)
+    rng = random.Random(0)
+
+    add_user(db, rng, 'user0')
+    assert export_analytics(db_path, out_dir)['game_sessions'] == 1
+    add_user(db, rng, 'user1')
+    assert export_analytics(db_path, out_dir)['game_sessions'] == 1
+
+    written = export_analytics(db_path, out_dir, full=True)
+    assert written == {'users': 2, 'user_preferences': 2, 'game_sessions': 2}
+    assert os.listdir(os.path.join(out_dir, 'game_sessions')) == ['part-0-2.parquet']
+    for table in written:
+        assert exported_rows(out_dir, table) == 2
+
+    add_user(db, rng, 'user2')
+    assert export_analytics(db_path, out_dir) == {'users': 1, 'user_preferences': 1, 'game_sessions': 1}
+    for table in written:
+        assert exported_rows(out_dir, table) == 3
+    assert sorted(os.listdir(out_dir)) == ['_watermarks.json', 'game_sessions', 'user_preferences', 'users']
+
+
+def test_migration_backfills_preference_revisions(tmp_path):
+    db_path = str(tmp_path / 'game_helper.db')
+    db = DatabaseManager(db_path)
+    rng = random.Random(1)
+    for i in range(3):
+        add_user(db, rng, f'user{i}')
+    conn = sqlite3.connect(db_path)
+    conn.execute('UPDATE user_preferences SET revision = NULL WHERE user_id > 1')
+    conn.commit()
+
+    DatabaseManager(db_path)
+
+    revisions = [row[0] for row in conn.execute('SELECT revision FROM user_preferences ORDER BY user_id')]
+    conn.close()
+    assert None not in revisions
+    assert len(set(revisions)) == 3
+    assert min(revisions[1:]) > revisions[0]
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import pytest
+
+from catalog import DEFAULT_CATALOG_PATH, CatalogLoader
+
+with open(DEFAULT_CATALOG_PATH) as f:
+    GAMES = json.load(f)
+
+
+def write_catalog(path, games):
+    with open(path, 'w') as f:
+        json.dump(games, f)
+    # Make sure the change is visible even on coarse mtime clocks
+    stamp = time.time() + 1
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = str(tmp_path / 'games_catalog.json')
+    write_catalog(path, GAMES)
+    return path
+
+
+@pytest.fixture
+def loaders():
+    started = []
+    yield started
+    for loader in started:
+        loader.stop()
+
+
+def start(loaders, path, poll_interval=60.0):
+    loader = CatalogLoader(path, poll_interval=poll_interval)
+    loaders.append(loader)
+    return loader
+
+
+def test_version_is_derived_from_file_content(catalog_path, loaders):
+    first = start(loaders, catalog_path)
+    second = start(loaders, catalog_path)
+    assert first.version == second.version
+
+    write_catalog(catalog_path, GAMES + [dict(GAMES[0], title='New Game')])
+    assert first.reload()
+    assert first.version != second.version
+    assert first.current().find('New Game') is not None
+
+    # Restoring the original content restores the original version
+    write_catalog(catalog_path, GAMES)
+    assert first.reload()
+    assert first.version == second.version
+
+
+def test_rewrite_with_same_content_keeps_snapshot(catalog_path, loaders):
+    loader = start(loaders, catalog_path)
+    snapshot = loader.current()
+
+    write_catalog(catalog_path, GAMES)
+
+    assert not loader.reload()
+    assert loader.current() is snapshot
+
+
+@pytest.mark.parametrize('entry', [dict(GAMES[0], platform=['Web', 'PC']), [1, 2], {'title': 'Untitled'}])
+def test_invalid_entries_keep_previous_snapshot(catalog_path, loaders, entry):
+    loader = start(loaders, catalog_path)
+    version = loader.version
+
+    write_catalog(catalog_path, GAMES + [entry])
+
+    assert not loader.reload()
+    assert loader.version == version
+    assert loader.last_error.startswith("Error loading catalog: Catalog entry 3")
+
+
+def test_watcher_survives_bad_files(catalog_path, loaders):
+    loader = start(loaders, catalog_path, poll_interval=0.02)
+    version = loader.version
+
+    write_catalog(catalog_path, GAMES + [[1, 2]])
+    time.sleep(0.2)
+    assert loader.last_error is not None
+    assert loader._thread.is_alive()
+
+    write_catalog(catalog_path, GAMES + [dict(GAMES[0], title='New Game')])
+    deadline = time.monotonic() + 2
+    while loader.version == version and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert loader.version != version
+    assert loader.last_error is None
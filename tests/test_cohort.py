@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from db_utils import DatabaseManager
+from load_simulator import sample_user_data
+from user_features import LEISURE_DEVICES, encode_mask, supersets
+
+USERS = 80
+
+
+@pytest.fixture(scope='module')
+def seeded(tmp_path_factory):
+    db = DatabaseManager(str(tmp_path_factory.mktemp('cohort') / 'game_helper.db'))
+    rng = random.Random(42)
+    users = {}
+    for i in range(USERS):
+        data = sample_user_data(rng)
+        assert db.create_user(f'user{i}', 'secret', data)[0]
+        users[f'user{i}'] = data
+    return db, users
+
+
+def expected(users, predicate):
+    return sorted(name for name, data in users.items() if predicate(data))
+
+
+def test_supersets_contain_required_bits():
+    required = encode_mask(['Tablet', 'Mobile'], LEISURE_DEVICES)
+    masks = supersets(required, len(LEISURE_DEVICES))
+
+    assert len(masks) == 4
+    assert all(mask & required == required for mask in masks)
+
+
+@pytest.mark.parametrize('filters, predicate', [
+    ({'min_severity': 7}, lambda d: d['memory_challenge_severity'] >= 7),
+    ({'devices': ['Tablet']}, lambda d: 'Tablet' in d['leisure_devices']),
+    ({'devices': ['Tablet', 'Computer'], 'focus_areas': ['Memory']},
+     lambda d: {'Tablet', 'Computer'} <= set(d['leisure_devices']) and 'Memory' in d['cognitive_focus_areas']),
+    ({'yes_answers': ['everyday_problems'], 'no_answers': ['device_usability']},
+     lambda d: d['everyday_problems'] == 'Yes' and d['device_usability'] == 'No'),
+    ({'max_severity': 5, 'focus_difficulty': (3, 8), 'time_spent': (None, 2)},
+     lambda d: d['memory_challenge_severity'] <= 5 and 3 <= d['focus_difficulty'] <= 8 and d['time_spent'] <= 2),
+])
+def test_cohort_matches_brute_force(seeded, filters, predicate):
+    db, users = seeded
+    matches = expected(users, predicate)
+
+    assert matches, "filter should match part of the seeded users"
+    assert sorted(db.find_cohort(limit=None, **filters)) == matches
+    assert db.count_cohort(**filters) == len(matches)
+
+
+def test_find_cohort_limit(seeded):
+    db, _ = seeded
+    assert len(db.find_cohort(limit=5)) == 5
+    assert db.count_cohort() == USERS
+
+
+def test_cohort_follows_preference_updates(seeded):
+    db, users = seeded
+    name = next(name for name, data in users.items() if 'Mobile' not in data['leisure_devices'])
+    before = db.count_cohort(devices=['Mobile'])
+
+    assert db.update_user_preferences(name, {'leisure_devices': ['Mobile']})[0]
+    users[name]['leisure_devices'] = ['Mobile']
+
+    assert name in db.find_cohort(limit=None, devices=['Mobile'])
+    assert db.count_cohort(devices=['Mobile']) == before + 1
+
+
+def test_unknown_filter_values_are_rejected(seeded):
+    db, _ = seeded
+    with pytest.raises(ValueError):
+        db.find_cohort(devices=['Smartwatch'])
+    with pytest.raises(ValueError):
+        db.count_cohort(age=(1, 2))
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from db_utils import DatabaseManager
+from difficulty import (DEFAULT_RATING, DEFAULT_RD, MIN_RD, game_rating, inflate_rd, is_near_level,
+                        outcome_from_score, update_skill)
+from load_simulator import sample_user_data
+
+
+def test_outcome_is_clamped():
+    assert outcome_from_score(-5) == 0.0
+    assert outcome_from_score(70) == 0.7
+    assert outcome_from_score(150) == 1.0
+
+
+@pytest.mark.parametrize('difficulty', ['Easy', 'Medium', 'Hard'])
+def test_rating_moves_towards_the_outcome(difficulty):
+    target = game_rating(difficulty)
+    won, _ = update_skill(DEFAULT_RATING, DEFAULT_RD, target, 1.0)
+    lost, _ = update_skill(DEFAULT_RATING, DEFAULT_RD, target, 0.0)
+
+    assert lost < DEFAULT_RATING < won
+
+
+def test_harder_wins_count_for_more():
+    easy, _ = update_skill(DEFAULT_RATING, DEFAULT_RD, game_rating('Easy'), 1.0)
+    hard, _ = update_skill(DEFAULT_RATING, DEFAULT_RD, game_rating('Hard'), 1.0)
+
+    assert hard - DEFAULT_RATING > easy - DEFAULT_RATING
+
+
+def test_rd_shrinks_with_sessions_down_to_the_floor():
+    rating, rd = DEFAULT_RATING, DEFAULT_RD
+    deviations = []
+    for _ in range(200):
+        rating, rd = update_skill(rating, rd, game_rating('Medium'), 0.6)
+        deviations.append(rd)
+
+    assert all(later <= earlier for earlier, later in zip(deviations, deviations[1:]))
+    assert deviations[0] < DEFAULT_RD
+    assert deviations[-1] == MIN_RD
+
+
+def test_settled_estimates_move_less():
+    fresh, _ = update_skill(DEFAULT_RATING, DEFAULT_RD, game_rating('Medium'), 1.0)
+    settled, _ = update_skill(DEFAULT_RATING, 60.0, game_rating('Medium'), 1.0)
+
+    assert fresh - DEFAULT_RATING > settled - DEFAULT_RATING > 0
+
+
+def test_idle_time_grows_rd_up_to_the_prior():
+    assert inflate_rd(60.0, 0) == 60.0
+    assert 60.0 < inflate_rd(60.0, 30) < DEFAULT_RD
+    assert inflate_rd(60.0, 10000) == DEFAULT_RD
+
+    _, after_break = update_skill(DEFAULT_RATING, 60.0, game_rating('Medium'), 0.5, days_idle=90)
+    _, without_break = update_skill(DEFAULT_RATING, 60.0, game_rating('Medium'), 0.5)
+    assert after_break > without_break
+
+
+def test_near_level_window_widens_with_uncertainty():
+    assert is_near_level(1500.0, 30.0, game_rating('Hard'))
+    assert not is_near_level(1300.0, 30.0, game_rating('Hard'))
+    assert is_near_level(1300.0, DEFAULT_RD, game_rating('Hard'))
+
+
+def test_recorded_sessions_update_stored_skill(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'game_helper.db'))
+    assert db.create_user('player', 'secret', sample_user_data(random.Random(0)))[0]
+    for score in (90, 95, 100):
+        assert db.record_game_session('player', {'game_name': 'Memory Match', 'score': score, 'duration': 5,
+                                                 'difficulty': 'Hard', 'cognitive_focus': 'Memory'})[0]
+    # Unscored sessions are stored but leave the estimate alone
+    assert db.record_game_session('player', {'game_name': 'Memory Match', 'score': None, 'duration': 5,
+                                             'difficulty': 'Hard', 'cognitive_focus': 'Memory'})[0]
+
+    skill = db.get_user_skills('player')['Memory']
+    assert skill['sessions'] == 3
+    assert skill['rating'] > DEFAULT_RATING
+    assert skill['rd'] < DEFAULT_RD
@@ -0,0 +1,61 @@
+import pytest
+
+from catalog import CatalogSnapshot
+from experiments import RANKING_EXPERIMENT, STRATEGIES, Experiment, bucket, get_explainer, get_strategy
+
+GAMES = [
+    {'title': f'{focus} {difficulty}', 'difficulty': difficulty, 'platform': 'Web',
+     'cognitive_focus': focus, 'description': 'A game'}
+    for focus in ('Memory', 'Attention', 'Language')
+    for difficulty in ('Easy', 'Medium', 'Hard')
+]
+CATALOG = CatalogSnapshot(GAMES, version='test')
+# A settled beginner in Memory; other areas fall back to the prior
+SKILLS = {'Memory': {'rating': 1250.0, 'rd': 40.0, 'sessions': 30}}
+
+
+@pytest.mark.parametrize('name', sorted(STRATEGIES))
+def test_matched_to_level_drops_out_of_reach_games(name):
+    titles = {game['title'] for game in get_strategy(name)(CATALOG, SKILLS, ['Memory'])}
+
+    assert 'Memory Easy' in titles
+    assert 'Memory Hard' not in titles
+    # The wide prior keeps every difficulty in areas without sessions
+    assert {'Attention Easy', 'Attention Medium', 'Attention Hard'} <= titles
+
+
+@pytest.mark.parametrize('name', sorted(STRATEGIES))
+def test_explicit_difficulty_and_k(name):
+    ranked = get_strategy(name)(CATALOG, SKILLS, ['Language'], 'Hard', 2)
+
+    assert len(ranked) == 2
+    assert all(game['difficulty'] == 'Hard' for game in ranked)
+
+
+def test_profile_only_ranks_and_explains_by_focus_area():
+    ranked = get_strategy('profile_only')(CATALOG, {}, ['Language'])
+    explanations = get_explainer('profile_only')(ranked, {}, ['Language'])
+
+    assert {game['cognitive_focus'] for game in ranked[:3]} == {'Language'}
+    assert [e['contributions'] for e in explanations[:3]] == [{'focus_area_match': 0.5}] * 3
+    assert explanations[3]['score'] == 0.0
+
+
+def test_blended_explanations_carry_skill_terms():
+    ranked = get_strategy('blended')(CATALOG, SKILLS, ['Memory'], k=1)
+    contributions = get_explainer('blended')(ranked, SKILLS, ['Memory'])[0]['contributions']
+
+    assert {'level_fit', 'focus_area_match', 'skill_rating', 'expected_success'} <= set(contributions)
+
+
+def test_assignment_is_stable_and_balanced():
+    arms = [RANKING_EXPERIMENT.assign(f'user{i}') for i in range(4000)]
+
+    assert arms == [RANKING_EXPERIMENT.assign(f'user{i}') for i in range(4000)]
+    assert 0.45 < arms.count('blended') / len(arms) < 0.55
+    assert bucket('user1', 'a') != bucket('user1', 'b') or bucket('user2', 'a') != bucket('user2', 'b')
+
+
+def test_experiment_rejects_unknown_arms():
+    with pytest.raises(ValueError):
+        Experiment('bad', {'blended': 0.5, 'missing': 0.5})
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from reranking import diversify, encode_attributes, focus_coverage, mmr_rerank
+
+FOCUS_AREAS = ["Memory", "Attention", "Problem Solving", "Language", "Spatial Skills"]
+PLATFORMS = ["Web", "Mobile", "PC", "Tablet", "Gaming Console"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def skewed_catalog(n, seed=0, bonus=0.5):
+    """Random games whose relevance favours the first focus area."""
+    rng = np.random.default_rng(seed)
+    focus = rng.integers(len(FOCUS_AREAS), size=n)
+    platform = rng.integers(len(PLATFORMS), size=n)
+    difficulty = rng.integers(len(DIFFICULTIES), size=n)
+    games = [
+        {"title": f"Game {i}", "cognitive_focus": FOCUS_AREAS[f],
+         "platform": PLATFORMS[p], "difficulty": DIFFICULTIES[d]}
+        for i, (f, p, d) in enumerate(zip(focus, platform, difficulty))
+    ]
+    relevance = rng.normal(size=n) + np.where(focus == 0, bonus, 0.0)
+    return games, relevance
+
+
+def test_mmr_covers_more_focus_areas_than_top_k():
+    games, relevance = skewed_catalog(1000, bonus=2.0)
+    attributes = encode_attributes(games)
+    k = 5
+
+    top_k = [games[i] for i in np.argsort(-relevance)[:k]]
+    mmr = [games[i] for i in mmr_rerank(relevance, attributes, k, diversity=0.5)]
+
+    assert focus_coverage(mmr, FOCUS_AREAS) > focus_coverage(top_k, FOCUS_AREAS)
+
+
+def test_zero_diversity_keeps_relevance_order():
+    games, relevance = skewed_catalog(500)
+    order = mmr_rerank(relevance, encode_attributes(games), 20, diversity=0.0)
+
+    np.testing.assert_array_equal(order, np.argsort(-relevance, kind="stable")[:20])
+
+
+def test_diversify_keeps_games_beyond_cap_in_score_order():
+    games, relevance = skewed_catalog(300)
+    cap = 50
+
+    ranked = diversify(games, relevance, k=len(games), candidate_cap=cap)
+
+    assert len(ranked) == len(games)
+    assert len({game["title"] for game in ranked}) == len(games)
+    scores = {game["title"]: score for game, score in zip(games, relevance)}
+    tail = [scores[game["title"]] for game in ranked[cap:]]
+    assert tail == sorted(tail, reverse=True)
+    # The re-ranked head is exactly the top-C by score
+    assert min(scores[game["title"]] for game in ranked[:cap]) >= max(tail)
+
+
+def test_mmr_only_considers_candidate_cap():
+    games, relevance = skewed_catalog(2000)
+    cap = 30
+    top_c = set(np.argsort(-relevance)[:cap].tolist())
+
+    order = mmr_rerank(relevance, encode_attributes(games), 10, diversity=0.9, candidate_cap=cap)
+
+    assert set(order.tolist()) <= top_c
+
+
+def test_mmr_time_bound_at_100k_games():
+    games, relevance = skewed_catalog(100000)
+    attributes = encode_attributes(games)
+
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        mmr_rerank(relevance, attributes, 10, candidate_cap=200)
+        best = min(best, time.perf_counter() - start)
+
+    # O(N + k*C) is well under a millisecond here; O(N^2) would take minutes
+    assert best < 0.05
+
+
+def test_diversify_top_k_is_a_prefix_of_the_full_ranking():
+    games, relevance = skewed_catalog(500)
+
+    full = diversify(games, relevance)
+    assert diversify(games, relevance, k=5) == full[:5]
+
+
+def test_rank_games_selects_only_k(monkeypatch):
+    import recommender
+
+    games, _ = skewed_catalog(400)
+    calls = []
+
+    def counting_mmr(relevance, attributes, k, *args, **kwargs):
+        calls.append(k)
+        return mmr_rerank(relevance, attributes, k, *args, **kwargs)
+
+    monkeypatch.setattr('reranking.mmr_rerank', counting_mmr)
+    top = recommender.rank_games(games, {}, ['Memory'], k=2)
+
+    assert len(top) == 2
+    assert calls == [2]
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from write_queue import _STOP, GroupCommitWriter, _PendingWrite
+
+
+def make_writer(tmp_path, **kwargs):
+    db_path = str(tmp_path / 'writes.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE items (value INTEGER)')
+    conn.close()
+    writer = GroupCommitWriter(lambda: sqlite3.connect(db_path, check_same_thread=False),
+                               lambda conn: conn.execute('BEGIN IMMEDIATE'), **kwargs)
+    return writer, db_path
+
+
+def insert(cursor, value, delay=0.0):
+    time.sleep(delay)
+    cursor.execute('INSERT INTO items (value) VALUES (?)', (value,))
+    return True, "inserted"
+
+
+def submit_in_thread(writer, *args):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(writer.submit(insert, args, "Error")))
+    thread.start()
+    return thread, results
+
+
+def test_submit_commits_and_returns_result(tmp_path):
+    writer, db_path = make_writer(tmp_path)
+    assert writer.submit(insert, (1,), "Error") == (True, "inserted")
+    writer.close()
+    assert sqlite3.connect(db_path).execute('SELECT value FROM items').fetchall() == [(1,)]
+
+
+def test_submit_during_close_does_not_hang(tmp_path):
+    writer, db_path = make_writer(tmp_path)
+    slow, slow_result = submit_in_thread(writer, 1, 0.3)
+    time.sleep(0.05)
+    closer = threading.Thread(target=writer.close)
+    closer.start()
+    time.sleep(0.05)
+
+    late, late_result = submit_in_thread(writer, 2)
+    late.join(2)
+
+    assert not late.is_alive()
+    assert late_result == [(False, "Error: writer is closed")]
+    slow.join(2)
+    closer.join(2)
+    # The write already queued before close() is still committed
+    assert slow_result == [(True, "inserted")]
+    assert sqlite3.connect(db_path).execute('SELECT value FROM items').fetchall() == [(1,)]
+
+
+def test_writes_left_behind_stop_are_failed(tmp_path):
+    writer, _ = make_writer(tmp_path)
+    blocker, _ = submit_in_thread(writer, 1, 0.2)
+    time.sleep(0.05)
+    # Queue an item behind the stop marker while the writer is busy
+    stranded = _PendingWrite(insert, (2,), "Error")
+    writer._queue.put(_STOP)
+    writer._queue.put(stranded)
+
+    blocker.join(2)
+    writer.close(timeout=2)
+
+    assert stranded.done.is_set()
+    assert stranded.result == (False, "Error: writer is closed")
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_failed_connection_releases_waiters(tmp_path):
+    def connect():
+        time.sleep(0.1)
+        raise sqlite3.OperationalError("unable to open database file")
+
+    writer = GroupCommitWriter(connect, lambda conn: None)
+    thread, result = submit_in_thread(writer, 1)
+    thread.join(2)
+    writer.close(timeout=2)
+
+    assert not thread.is_alive()
+    assert result == [(False, "Error: writer is closed")]
@@ -0,0 +1,79 @@
+"""
+Integer encoding of user_preferences for cohort queries.
+
+The signup form stores multi-selects as JSON strings and radio answers as
+free TEXT. The user_features table keeps the same answers as small integers:
+multi-selects become bitmasks, Yes/No answers become one bit each in
+yes_flags, and single-choice answers become positional codes. The option
+lists below mirror the choices offered in streamlit_app.login_signup_page;
+append new options at the end so existing codes stay valid.
+"""
+import json
+from typing import Dict, Iterable, List, Optional
+
+LEISURE_DEVICES = ["Computer", "Tablet", "Gaming Console", "Mobile"]
+COGNITIVE_FOCUS_AREAS = ["Memory", "Attention", "Problem Solving", "Language", "Spatial Skills"]
+
+YES_NO_FIELDS = [
+    "everyday_problems",
+    "remembering_info",
+    "language_difficulties",
+    "physical_limitations",
+    "device_usability",
+    "multiplayer_interaction",
+    "accommodations_needed",
+    "visual_hearing_impairments",
+    "previous_experience",
+]
+
+CATEGORICAL_FIELDS = {
+    "gender": ["Male", "Female", "Other"],
+    "gameplay_preference": ["Fast-paced", "Slow-paced"],
+    "game_preferences_type": ["Single-player", "Multiplayer", "Both"],
+    "progress_tracking": ["Visual graphs", "Daily summaries", "No tracking", "Other"],
+}
+
+SCALE_FIELDS = ["memory_challenge_severity", "focus_difficulty", "navigation_ability", "time_spent"]
+
+FEATURE_COLUMNS = SCALE_FIELDS + ["device_mask", "focus_mask", "yes_flags"] + list(CATEGORICAL_FIELDS)
+
+
+def _as_list(value) -> List[str]:
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except (TypeError, json.JSONDecodeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def encode_mask(values: Iterable[str], options: List[str]) -> int:
+    """Return the bitmask of values within options; unknown values are ignored."""
+    mask = 0
+    for value in values:
+        if value in options:
+            mask |= 1 << options.index(value)
+    return mask
+
+
+def supersets(required: int, width: int) -> List[int]:
+    """All masks of the given bit width that contain every bit of required."""
+    return [mask for mask in range(1 << width) if mask & required == required]
+
+
+def encode_preferences(row: Dict) -> Dict[str, Optional[int]]:
+    """
+    Encode a user_preferences row (joined with users for gender) into
+    user_features columns.
+    """
+    features: Dict[str, Optional[int]] = {field: row.get(field) for field in SCALE_FIELDS}
+    features["device_mask"] = encode_mask(_as_list(row.get("leisure_devices")), LEISURE_DEVICES)
+    features["focus_mask"] = encode_mask(_as_list(row.get("cognitive_focus_areas")), COGNITIVE_FOCUS_AREAS)
+    features["yes_flags"] = sum(1 << i for i, field in enumerate(YES_NO_FIELDS) if row.get(field) == "Yes")
+    for field, options in CATEGORICAL_FIELDS.items():
+        value = row.get(field)
+        features[field] = options.index(value) if value in options else None
+    return features
@@ -0,0 +1,135 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class _PendingWrite:
+    """A single write waiting for its group commit."""
+
+    def __init__(self, fn: Callable, args: tuple, error_prefix: str):
+        self.fn = fn
+        self.args = args
+        self.error_prefix = error_prefix
+        self.result: Tuple[bool, str] = (False, f"{error_prefix}: write was not executed")
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Serialize writes through one background thread and one connection.
+
+    Callers block in submit() until their write has been committed. The
+    writer drains whatever is queued (up to max_batch, waiting at most
+    max_delay for stragglers) and commits it as a single transaction, so
+    concurrent sessions share one fsync and never contend for the write
+    lock among themselves. Each write runs inside its own SAVEPOINT, so a
+    failing write is rolled back without affecting the rest of its batch.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection],
+                 begin: Callable[[sqlite3.Connection], None],
+                 max_batch: int = 64, max_delay: float = 0.002):
+        self._connect = connect
+        self._begin = begin
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue" = queue.Queue()
+        # Guards closed so nothing can be queued behind _STOP
+        self._lock = threading.Lock()
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, name='sqlite-group-commit', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable, args: tuple, error_prefix: str) -> Tuple[bool, str]:
+        """
+        Queue fn(cursor, *args) and wait for its batch to commit.
+        Returns: the (success, message) tuple produced by fn, or an error tuple.
+        """
+        item = _PendingWrite(fn, args, error_prefix)
+        with self._lock:
+            if self.closed or not self._thread.is_alive():
+                return False, f"{error_prefix}: writer is closed"
+            self._queue.put(item)
+        item.done.wait()
+        return item.result
+
+    def close(self, timeout: Optional[float] = None):
+        """Commit everything already queued and stop the writer thread."""
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self._serve()
+        finally:
+            self._fail_pending()
+
+    def _serve(self):
+        conn = self._connect()
+        # Transactions are managed explicitly below.
+        conn.isolation_level = None
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _fail_pending(self):
+        """Release every caller still waiting on a write that will never run."""
+        with self._lock:
+            self.closed = True
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                item.result = (False, f"{item.error_prefix}: writer is closed")
+                item.done.set()
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: List[_PendingWrite]):
+        c = conn.cursor()
+        try:
+            self._begin(conn)
+            for item in batch:
+                c.execute('SAVEPOINT pending_write')
+                try:
+                    item.result = item.fn(c, *item.args)
+                    if not item.result[0]:
+                        c.execute('ROLLBACK TO pending_write')
+                except Exception as e:
+                    c.execute('ROLLBACK TO pending_write')
+                    item.result = (False, f"{item.error_prefix}: {str(e)}")
+                c.execute('RELEASE pending_write')
+            c.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                c.execute('ROLLBACK')
+            for item in batch:
+                item.result = (False, f"{item.error_prefix}: {str(e)}")
+        finally:
+            for item in batch:
+                item.done.set()